@@ -0,0 +1,59 @@
+"""add task listing indexes
+
+Revision ID: 8b4e0c6d2f31
+Revises: 3f1c2b7a9d10
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b4e0c6d2f31"
+down_revision: Union[str, None] = "3f1c2b7a9d10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so that writes to a large table are not blocked.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_completed_created_at_id",
+            "tasks",
+            ["completed", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_tasks_created_at_id",
+            "tasks",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_tasks_title_pattern",
+            "tasks",
+            ["title"],
+            postgresql_ops={"title": "text_pattern_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_title_pattern", table_name="tasks", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_tasks_created_at_id", table_name="tasks", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_tasks_completed_created_at_id",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,37 @@
+"""add task updated_at
+
+Revision ID: d5a1f3e7b920
+Revises: c27d5e9a4b83
+Create Date: 2026-10-18 12:00:00.000000
+
+The column has a non-volatile default, so adding it does not rewrite the
+table. Existing rows get the migration time as their last modification.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a1f3e7b920"
+down_revision: Union[str, None] = "c27d5e9a4b83"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "updated_at")
@@ -0,0 +1,32 @@
+"""add task version
+
+Revision ID: 6e2b8c4f1a57
+Revises: d5a1f3e7b920
+Create Date: 2026-10-18 13:00:00.000000
+
+The column has a constant default, so adding it does not rewrite the
+table.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e2b8c4f1a57"
+down_revision: Union[str, None] = "d5a1f3e7b920"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "version")
@@ -2,6 +2,7 @@ import os
 
 from fastapi import APIRouter
 
+from .metrics import metrics_router
 from .v1 import v1_router
 
 router = APIRouter()
@@ -9,5 +10,6 @@ router.include_router(
     v1_router,
     prefix="/v1",
 )
+router.include_router(metrics_router)
 
 __all__ = ["router"]
@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.metrics import registry
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get(
+    "/metrics",
+    summary="Metrics",
+    description="Request, database and connection pool metrics of the worker "
+    "process answering the scrape, in the Prometheus text exposition format. "
+    "Workers do not share their figures, so each needs its own scrape target",
+    status_code=200,
+    response_class=PlainTextResponse,
+    tags=["Monitoring"],
+)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
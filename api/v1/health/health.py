@@ -1,8 +1,17 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 from app.schemas.exceptions import UnhealthyDatabaseError
-from app.schemas.response import HealthResponse
-from core.database.session import test_connection
+from app.schemas.response import (
+    CacheStatsResponse,
+    HealthResponse,
+    LivenessResponse,
+    PoolStatsResponse,
+    ReadinessResponse,
+)
+from core.cache import caches
+from core.database.health import prober
+from core.database.session import get_pool_stats, test_connection
 from core.utils.logging import logger
 
 health_router = APIRouter()
@@ -28,3 +37,55 @@ async def health_check() -> HealthResponse:
         "status": "healthy" if db_connected else "unhealthy",
         "database_connected": db_connected,
     }
+
+
+@health_router.get(
+    "/live",
+    summary="Liveness Probe",
+    description="Whether the process is up and serving requests. Does no I/O",
+    status_code=200,
+)
+async def liveness() -> LivenessResponse:
+    return {"status": "alive"}
+
+
+@health_router.get(
+    "/ready",
+    summary="Readiness Probe",
+    description="Whether the database was reachable at the last background "
+    "probe. Answers from the outcome of that probe without using a connection",
+    status_code=200,
+    responses={
+        503: {
+            "model": ReadinessResponse,
+            "description": "The database was unreachable or the probe is stale",
+        }
+    },
+)
+async def readiness() -> ReadinessResponse:
+    status = prober.status()
+    if not prober.ready:
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+
+@health_router.get(
+    "/cache",
+    summary="Read Cache Statistics",
+    description="Size and hit, miss, eviction and expiration counters of the "
+    "read cache of each table, for this worker process",
+    status_code=200,
+)
+async def cache_stats() -> dict[str, CacheStatsResponse]:
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+@health_router.get(
+    "/pool",
+    summary="Connection Pool Statistics",
+    description="Occupancy and checkout wait times of the connection pool of "
+    "the writer and of each read replica, for this worker process",
+    status_code=200,
+)
+async def pool_stats() -> dict[str, PoolStatsResponse]:
+    return get_pool_stats()
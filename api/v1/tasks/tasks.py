@@ -1,6 +1,19 @@
-from typing import List, Optional, Union
+from collections.abc import Mapping
+from datetime import datetime
+from typing import List, Literal, Optional, Union
 
-from fastapi import APIRouter, Body, Depends, Path, Query, Request, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
 from app.controllers.task import TaskController
 from app.schemas.exceptions import (
@@ -9,13 +22,89 @@ from app.schemas.exceptions import (
     NotFoundError,
     UniqueConstraintViolation,
 )
-from app.schemas.request import TaskCreateRequest, TaskUpdateRequest
-from app.schemas.response import TaskResponse
-from core.exceptions import BadRequestException
+from app.schemas.request import (
+    TaskBulkCreateRequest,
+    TaskBulkDeleteRequest,
+    TaskBulkUpdateRequest,
+    TaskCreateRequest,
+    TaskFilter,
+    TaskUpdateRequest,
+)
+from app.schemas.response import (
+    TaskBulkCreateResponse,
+    TaskBulkDeleteResponse,
+    TaskBulkUpdateResponse,
+    TaskImportResponse,
+    TaskResponse,
+)
+from core.exceptions import BadRequestException, PreconditionFailedException
 from core.factory.factory import Factory
+from core.fastapi.responses import model_list_response, model_response
+from core.utils.http import (
+    etag_matches,
+    http_date,
+    make_etag,
+    parse_version_etag,
+    version_etag,
+)
+from core.utils.json import dumps_bytes
+from core.utils.stream import iter_csv_records, iter_ndjson_records
 
 task_router = APIRouter()
 
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+IMPORT_PARSERS = {"ndjson": iter_ndjson_records, "csv": iter_csv_records}
+
+
+def task_etag(task) -> str:
+    """
+    Strong ETag of a task, given as a row mapping or a model instance.
+    It only depends on the task's ID and version, which every write bumps,
+    so `If-Match` can be checked without reading the task.
+    """
+    if isinstance(task, Mapping):
+        return version_etag(task["version"], task["id"])
+    return version_etag(task.version, task.id)
+
+
+def if_match_versions(if_match: str, task_id: int) -> list[int]:
+    """
+    Versions named by the tags of an `If-Match` header that are ETags of the
+    task `task_id`. Tags of other tasks and foreign tags are left out.
+    """
+    versions = []
+    for tag in if_match.split(","):
+        version = parse_version_etag(tag)
+        if version is not None and etag_matches(
+            tag, version_etag(version, task_id)
+        ):
+            versions.append(version)
+    return versions
+
+
+def get_task_filter(
+    completed: Optional[bool] = Query(
+        default=None, description="Filter by completion status"
+    ),
+    created_before: Optional[datetime] = Query(
+        default=None, description="Only tasks created before this time"
+    ),
+    created_after: Optional[datetime] = Query(
+        default=None, description="Only tasks created at or after this time"
+    ),
+    title_prefix: Optional[str] = Query(
+        default=None,
+        min_length=1,
+        description="Only tasks whose title starts with this text",
+    ),
+) -> TaskFilter:
+    return TaskFilter(
+        completed=completed,
+        created_before=created_before,
+        created_after=created_after,
+        title_prefix=title_prefix,
+    )
+
 
 @task_router.post(
     "/",
@@ -27,6 +116,10 @@ task_router = APIRouter()
     * Create a new task
     * Set completion status
     * Provide task description
+    
+    With `on_conflict`, a task whose ID already exists is either kept
+    (`ignore`) or replaced (`update`) and returned with status 200 instead
+    of failing.
     """,
     tags=["Tasks"],
     status_code=status.HTTP_201_CREATED,
@@ -42,7 +135,12 @@ task_router = APIRouter()
 )
 async def create_task(
     request: Request,
+    response: Response,
     task_create: TaskCreateRequest = Body(..., description="Task data to create"),
+    on_conflict: Optional[Literal["ignore", "update"]] = Query(
+        default=None,
+        description="Keep (ignore) or replace (update) a task with the same ID",
+    ),
     task_controller: TaskController = Depends(Factory().get_task_controller),
 ) -> TaskResponse:
     """
@@ -53,7 +151,10 @@ async def create_task(
 
     Args:
         request (Request): The incoming request
+        response (Response): The outgoing response, whose status is set to 200
+            when an existing task is returned
         task_create (TaskCreateRequest): The task data to create
+        on_conflict (Optional[str]): How to resolve an existing task with the same ID
         task_controller (TaskController): The task controller instance
 
     Returns:
@@ -63,10 +164,213 @@ async def create_task(
         BadRequestException: If the task ID is not positive
         ValidationError: If required fields are missing
     """
-    task = await task_controller.create(attributes=task_create.model_dump())
+    if on_conflict is None:
+        return await task_controller.create(attributes=task_create.model_dump())
+    task, created = await task_controller.upsert(
+        attributes=task_create.model_dump(), on_conflict=on_conflict
+    )
+    if not created:
+        response.status_code = status.HTTP_200_OK
     return task
 
 
+@task_router.post(
+    "/bulk",
+    summary="Create Tasks in Bulk",
+    description="""
+    Create many tasks in a single request.
+    
+    This endpoint allows you to:
+    * Create up to 10000 tasks at once
+    * Get back the created tasks
+    * Get back the tasks skipped because their ID already exists
+    
+    The batch is validated as a whole; tasks that conflict do not abort
+    the rest of the batch.
+    """,
+    tags=["Tasks"],
+    status_code=status.HTTP_201_CREATED,
+    response_description="Tasks created successfully",
+    response_model=TaskBulkCreateResponse,
+    responses={500: {"model": DatabaseError, "description": "Database error occured"}},
+)
+async def bulk_create_tasks(
+    task_bulk_create: TaskBulkCreateRequest = Body(
+        ..., description="Tasks data to create"
+    ),
+    task_controller: TaskController = Depends(Factory().get_task_controller),
+) -> Response:
+    """
+    Create many tasks at once.
+
+    Args:
+        task_bulk_create (TaskBulkCreateRequest): The tasks data to create
+        task_controller (TaskController): The task controller instance
+
+    Returns:
+        Response: JSON of the created tasks and the conflicting ones
+    """
+    result = await task_controller.bulk_create(
+        attributes_list=[task.model_dump() for task in task_bulk_create.tasks]
+    )
+    return model_response(
+        TaskBulkCreateResponse, result, status_code=status.HTTP_201_CREATED
+    )
+
+
+@task_router.post(
+    "/import",
+    summary="Import Tasks",
+    description="""
+    Import tasks from a newline-delimited JSON or CSV upload.
+    
+    This endpoint allows you to:
+    * Upload task dumps of any size as the raw request body
+    * Choose between NDJSON and CSV (with a header row)
+    * Get back the number of imported tasks and the rejected lines
+    
+    The body is parsed while it is received and written in batches, each
+    committed on its own; batches written before a failure are kept.
+    """,
+    tags=["Tasks"],
+    status_code=status.HTTP_200_OK,
+    response_description="Tasks imported",
+    response_model=TaskImportResponse,
+    responses={
+        400: {"description": "Malformed upload"},
+        500: {"model": DatabaseError, "description": "Database error occured"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    import_format: Literal["ndjson", "csv"] = Query(
+        default="ndjson", alias="format", description="Format of the upload"
+    ),
+    task_controller: TaskController = Depends(Factory().get_task_controller),
+) -> TaskImportResponse:
+    """
+    Import tasks from the request body.
+
+    Args:
+        request (Request): The incoming request, whose body is the upload
+        import_format (str): Format of the upload, "ndjson" or "csv"
+        task_controller (TaskController): The task controller instance
+
+    Returns:
+        TaskImportResponse: The import report
+
+    Raises:
+        BadRequestException: If the upload cannot be read as text lines
+    """
+    records = IMPORT_PARSERS[import_format](request.stream())
+    try:
+        return await task_controller.import_records(
+            records, schema=TaskCreateRequest
+        )
+    except ValueError as e:
+        raise BadRequestException(str(e)) from e
+
+
+@task_router.patch(
+    "/",
+    summary="Update Tasks in Bulk",
+    description="""
+    Update every task matching a list of IDs or a filter.
+    
+    This endpoint allows you to:
+    * Update up to 10000 tasks by ID at once
+    * Update all tasks matching a filter (completion status, creation time)
+    * Get back the number of updated tasks
+    
+    Large sets are written in bounded chunks, each in its own transaction.
+    """,
+    tags=["Tasks"],
+    status_code=status.HTTP_200_OK,
+    response_description="Tasks updated successfully",
+    response_model=TaskBulkUpdateResponse,
+    responses={500: {"model": DatabaseError, "description": "Database error occured"}},
+)
+async def bulk_update_tasks(
+    task_bulk_update: TaskBulkUpdateRequest = Body(
+        ...,
+        description="Tasks to update and the fields to set",
+        example={"filter": {"completed": False}, "values": {"completed": True}},
+    ),
+    task_controller: TaskController = Depends(Factory().get_task_controller),
+) -> TaskBulkUpdateResponse:
+    """
+    Update many tasks at once.
+
+    Args:
+        task_bulk_update (TaskBulkUpdateRequest): The tasks selection and the
+            fields to update
+        task_controller (TaskController): The task controller instance
+
+    Returns:
+        TaskBulkUpdateResponse: The number of updated tasks
+    """
+    updated = await task_controller.update_many(
+        attributes=task_bulk_update.values.model_dump(exclude_unset=True),
+        ids=task_bulk_update.ids,
+        filters=task_bulk_update.filter and task_bulk_update.filter.to_filters(),
+    )
+    return {"updated": updated}
+
+
+@task_router.delete(
+    "/",
+    summary="Delete Tasks in Bulk",
+    description="""
+    Delete every task matching a list of IDs or a filter.
+    
+    This endpoint allows you to:
+    * Delete up to 10000 tasks by ID at once
+    * Delete all tasks matching a filter (completion status, creation time)
+    * Get back the number of deleted tasks
+    
+    Large sets are deleted in bounded chunks, each in its own transaction.
+    This operation cannot be undone.
+    """,
+    tags=["Tasks"],
+    status_code=status.HTTP_200_OK,
+    response_description="Tasks deleted successfully",
+    response_model=TaskBulkDeleteResponse,
+    responses={500: {"model": DatabaseError, "description": "Database error occured"}},
+)
+async def bulk_delete_tasks(
+    task_bulk_delete: TaskBulkDeleteRequest = Body(
+        ...,
+        description="Tasks to delete",
+        example={"filter": {"completed": True}},
+    ),
+    task_controller: TaskController = Depends(Factory().get_task_controller),
+) -> TaskBulkDeleteResponse:
+    """
+    Delete many tasks at once.
+
+    Args:
+        task_bulk_delete (TaskBulkDeleteRequest): The tasks selection
+        task_controller (TaskController): The task controller instance
+
+    Returns:
+        TaskBulkDeleteResponse: The number of deleted tasks
+    """
+    deleted = await task_controller.delete_many(
+        ids=task_bulk_delete.ids,
+        filters=task_bulk_delete.filter and task_bulk_delete.filter.to_filters(),
+    )
+    return {"deleted": deleted}
+
+
 @task_router.get(
     "/",
     summary="List All Tasks",
@@ -76,13 +380,30 @@ async def create_task(
     This endpoint allows you to:
     * Get all tasks
     * Paginate results
-    * Filter completed/incomplete tasks
+    * Filter completed/incomplete tasks, by creation time or title prefix
+    * Sort by ID or creation time, ascending or descending (`-` prefix)
+    
+    When a page is full, the `X-Next-Cursor` response header holds a cursor
+    that can be passed as `after` to fetch the next page. Cursor pagination
+    is preferred over `skip` for deep pages.
+    
+    With `count`, the `X-Total-Count` response header holds the number of
+    tasks matching the filters: `exact` counts them, `estimate` reads the
+    planner statistics and `cached` reuses a recent exact count.
+    
+    The page's `ETag` is derived from the IDs it holds and their latest
+    modification time; send it back in `If-None-Match` to get
+    `304 Not Modified` while the page is unchanged.
     """,
     tags=["Tasks"],
     status_code=status.HTTP_200_OK,
     response_description="List of tasks retrieved successfully",
     response_model=List[TaskResponse],
-    responses={500: {"model": DatabaseError, "description": "Database error occured"}},
+    responses={
+        304: {"description": "Page not modified"},
+        400: {"model": InvalidFormatError, "description": "Invalid pagination cursor"},
+        500: {"model": DatabaseError, "description": "Database error occured"},
+    },
 )
 async def get_tasks(
     skip: int = Query(
@@ -91,24 +412,163 @@ async def get_tasks(
     limit: int = Query(
         default=100, ge=1, le=100, description="Maximum number of tasks to return"
     ),
+    after: Optional[str] = Query(
+        default=None, description="Cursor of the previous page (X-Next-Cursor)"
+    ),
+    sort: Literal["id", "-id", "created_at", "-created_at"] = Query(
+        default="id", description="Field to sort by, '-' prefixed for descending"
+    ),
+    count: Optional[Literal["exact", "estimate", "cached"]] = Query(
+        default=None, description="Return the total count in X-Total-Count"
+    ),
+    task_filter: TaskFilter = Depends(get_task_filter),
+    if_none_match: Optional[str] = Header(
+        default=None, description="ETag of the page the client already has"
+    ),
     task_controller: TaskController = Depends(Factory().get_task_controller),
-) -> List[TaskResponse]:
+) -> Response:
     """
     Retrieve a list of all tasks.
 
     This endpoint returns a paginated list of tasks. You can optionally filter
-    by completion status.
+    by completion status, creation time or title prefix, and choose the sort.
 
     Args:
         skip (int): Number of tasks to skip (for pagination)
         limit (int): Maximum number of tasks to return
-        completed (Optional[bool]): Filter by completion status
+        after (Optional[str]): Cursor of the previous page
+        sort (str): Field to sort by, "-" prefixed for descending order
+        count (Optional[str]): How to compute the total count, if wanted
+        task_filter (TaskFilter): Filter by completion status, creation time
+            or title prefix
+        if_none_match (Optional[str]): ETag of a previously fetched page
         task_controller (TaskController): The task controller instance
 
     Returns:
-        List[TaskResponse]: List of tasks matching the criteria
+        Response: JSON list of the tasks matching the criteria, serialized
+            straight from the selected rows, or 304 if the page is unchanged
+
+    Raises:
+        BadRequestException: If the cursor is invalid
     """
-    return await task_controller.get_all(skip=skip, limit=limit)
+    filters = task_filter.to_filters()
+    tasks = await task_controller.get_all(
+        skip=skip, limit=limit, after=after, sort=sort, filters=filters, as_rows=True
+    )
+    last_modified = max((task["updated_at"] for task in tasks), default=None)
+    headers = {"ETag": make_etag(*(task["id"] for task in tasks), last_modified)}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    next_cursor = task_controller.next_cursor(tasks, limit, sort=sort)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response = Response(
+        content=dumps_bytes(tasks), media_type="application/json", headers=headers
+    )
+    if count:
+        total = await task_controller.count(filters=filters, mode=count)
+        response.headers["X-Total-Count"] = str(total)
+    return response
+
+
+@task_router.get(
+    "/search",
+    summary="Search Tasks",
+    description="""
+    Search tasks by the words in their title and description.
+    
+    This endpoint allows you to:
+    * Search with plain words, "quoted phrases", `or` and `-excluded` words
+    * Get the matches ranked by relevance, title matches first
+    * Paginate results
+    """,
+    tags=["Tasks"],
+    status_code=status.HTTP_200_OK,
+    response_description="Matching tasks retrieved successfully",
+    response_model=List[TaskResponse],
+    responses={500: {"model": DatabaseError, "description": "Database error occured"}},
+)
+async def search_tasks(
+    q: str = Query(
+        ..., min_length=1, max_length=256, description="Search query", examples=["milk"]
+    ),
+    skip: int = Query(
+        default=0, ge=0, description="Number of matches to skip (pagination)"
+    ),
+    limit: int = Query(
+        default=20, ge=1, le=100, description="Maximum number of matches to return"
+    ),
+    task_controller: TaskController = Depends(Factory().get_task_controller),
+) -> Response:
+    """
+    Search tasks by relevance.
+
+    Args:
+        q (str): The search query
+        skip (int): Number of matches to skip (for pagination)
+        limit (int): Maximum number of matches to return
+        task_controller (TaskController): The task controller instance
+
+    Returns:
+        Response: JSON list of the matching tasks, most relevant first
+    """
+    tasks = await task_controller.search(q, skip=skip, limit=limit)
+    return model_list_response(TaskResponse, tasks)
+
+
+@task_router.get(
+    "/export",
+    summary="Export Tasks",
+    description="""
+    Export all tasks as newline-delimited JSON or CSV.
+    
+    This endpoint allows you to:
+    * Download the whole task table in one request
+    * Choose between NDJSON and CSV
+    * Filter completed/incomplete tasks
+    
+    Rows are streamed from a server-side cursor, so the export is a single
+    consistent snapshot and never held in memory as a whole.
+    """,
+    tags=["Tasks"],
+    status_code=status.HTTP_200_OK,
+    response_description="Tasks exported successfully",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}},
+        500: {"model": DatabaseError, "description": "Database error occured"},
+    },
+)
+async def export_tasks(
+    export_format: Literal["ndjson", "csv"] = Query(
+        default="ndjson", alias="format", description="Format of the export"
+    ),
+    task_filter: TaskFilter = Depends(get_task_filter),
+    task_controller: TaskController = Depends(Factory().get_task_controller),
+) -> StreamingResponse:
+    """
+    Export all tasks.
+
+    Args:
+        export_format (str): Format of the export, "ndjson" or "csv"
+        task_filter (TaskFilter): Filter selecting the tasks to export
+        task_controller (TaskController): The task controller instance
+
+    Returns:
+        StreamingResponse: The streamed export
+    """
+    return StreamingResponse(
+        task_controller.export(
+            format=export_format, filters=task_filter.to_filters()
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
 
 
 @task_router.get(
@@ -122,12 +582,15 @@ async def get_tasks(
     * View all task details
     
     The task ID must be a positive integer.
+    The response carries an `ETag` and `Last-Modified`; send the ETag back
+    in `If-None-Match` to get `304 Not Modified` while the task is unchanged.
     """,
     tags=["Tasks"],
     status_code=status.HTTP_200_OK,
     response_description="Task retrieved successfully",
     response_model=TaskResponse,
     responses={
+        304: {"description": "Task not modified"},
         404: {"model": NotFoundError, "description": "Task not found"},
         400: {"model": InvalidFormatError, "description": "Invalid format for Task id"},
         500: {"model": DatabaseError, "description": "Database error occured"},
@@ -135,17 +598,22 @@ async def get_tasks(
 )
 async def get_task(
     task_id: str = Path(..., description="The ID of the task to retrieve", example="1"),
+    if_none_match: Optional[str] = Header(
+        default=None, description="ETag of the task the client already has"
+    ),
     task_controller: TaskController = Depends(Factory().get_task_controller),
-) -> TaskResponse:
+) -> Response:
     """
     Retrieve a specific task by its ID.
 
     Args:
         task_id (str): The ID of the task to retrieve
+        if_none_match (Optional[str]): ETag of a previously fetched version
         task_controller (TaskController): The task controller instance
 
     Returns:
-        TaskResponse: The requested task
+        Response: The requested task as JSON, serialized straight from its row,
+            or 304 if the task is unchanged
 
     Raises:
         BadRequestException: If the task ID is not a valid number
@@ -153,8 +621,16 @@ async def get_task(
     """
     if not task_id.isdigit():
         raise BadRequestException("Expected number, but received string")
-    task = await task_controller.get_by_id(id=int(task_id))
-    return task
+    task = await task_controller.get_by_id(id=int(task_id), as_rows=True)
+    headers = {
+        "ETag": task_etag(task),
+        "Last-Modified": http_date(task["updated_at"]),
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=dumps_bytes(task), media_type="application/json", headers=headers
+    )
 
 
 @task_router.put(
@@ -170,6 +646,12 @@ async def get_task(
     
     The task ID must be a positive integer.
     Only provided fields will be updated.
+    
+    With `upsert=true` the task is created (201) if it does not exist, or
+    replaced otherwise, in a single statement.
+    
+    Send the task's `ETag` in `If-Match` to only update it if nobody else
+    has since; otherwise `412 Precondition Failed` is returned.
     """,
     tags=["Tasks"],
     status_code=status.HTTP_200_OK,
@@ -178,10 +660,13 @@ async def get_task(
     responses={
         404: {"model": NotFoundError, "description": "Task not found"},
         400: {"model": InvalidFormatError, "description": "Invalid format for Task id"},
+        201: {"model": TaskResponse, "description": "Task created by upsert"},
+        412: {"description": "Task was modified since the ETag in If-Match"},
         500: {"model": DatabaseError, "description": "Database error occured"},
     },
 )
 async def update_task(
+    response: Response,
     task_id: str = Path(..., description="The ID of the task to update", example="1"),
     task_update: TaskUpdateRequest = Body(
         ...,
@@ -192,30 +677,60 @@ async def update_task(
             "completed": True,
         },
     ),
+    upsert: bool = Query(
+        default=False, description="Create the task if it does not exist"
+    ),
+    if_match: Optional[str] = Header(
+        default=None, description="ETag the task must still have"
+    ),
     task_controller: TaskController = Depends(Factory().get_task_controller),
 ) -> TaskResponse:
     """
     Update an existing task.
 
     Args:
+        response (Response): The outgoing response, whose status is set to 201
+            when the task is created and which carries the new ETag
         task_id (str): The ID of the task to update
         task_update (TaskUpdateRequest): The updated task data
+        upsert (bool): Create or replace the task instead of requiring it to exist
+        if_match (Optional[str]): ETag of the version the update is based on
         task_controller (TaskController): The task controller instance
 
     Returns:
         TaskResponse: The updated task
 
     Raises:
-        BadRequestException: If the task ID is not a valid number
+        BadRequestException: If the task ID is not a valid number, or If-Match
+            is combined with upsert
         NotFoundException: If the task is not found
+        PreconditionFailedException: If the task no longer matches If-Match
         UnprocessableEntity: If no updates are provided
     """
     if not task_id.isdigit():
         raise BadRequestException("Expected number, but received string")
+    expected_version = None
+    if if_match is not None:
+        if upsert:
+            raise BadRequestException("If-Match cannot be combined with upsert")
+        if if_match.strip() != "*":
+            expected_version = if_match_versions(if_match, int(task_id))
+            if not expected_version:
+                raise PreconditionFailedException("If-Match does not match the task")
+    if upsert:
+        task, created = await task_controller.upsert(
+            attributes={**task_update.model_dump(), "id": int(task_id)}
+        )
+        if created:
+            response.status_code = status.HTTP_201_CREATED
+        response.headers["ETag"] = task_etag(task)
+        return task
     task = await task_controller.update(
         id=int(task_id),
         attributes=task_update.model_dump(),
+        expected_version=expected_version,
     )
+    response.headers["ETag"] = task_etag(task)
     return task
 
 
@@ -263,4 +778,4 @@ async def delete_task(
     """
     if not task_id.isdigit():
         raise BadRequestException("Expected number, but received string")
-    return await task_controller.delete(id=int(task_id))
+    await task_controller.delete(id=int(task_id))
@@ -1,6 +1,7 @@
 from app.models.task import Task
 from app.repository.task import TaskRepository
 from core.controller.base import BaseController
+from core.exceptions.base import DatabaseError, InternalServerError
 
 
 class TaskController(BaseController[Task]):
@@ -15,3 +16,23 @@ class TaskController(BaseController[Task]):
         """
         super().__init__(model=Task, repository=task_repository)
         self.task_repository = task_repository
+
+    async def search(self, text: str, skip: int = 0, limit: int = 100) -> list[Task]:
+        """
+        Search tasks by relevance of their title and description.
+
+        Args:
+            text (str): The search query
+            skip (int, optional): Number of matches to skip. Defaults to 0
+            limit (int, optional): Maximum number of matches to return. Defaults to 100
+
+        Returns:
+            list[Task]: The matching tasks, most relevant first
+
+        Raises:
+            DatabaseError: If there's an error during database operation
+        """
+        try:
+            return await self.task_repository.search(text, skip=skip, limit=limit)
+        except DatabaseError as e:
+            raise InternalServerError from e
@@ -1,6 +1,17 @@
-from sqlalchemy import BigInteger, Boolean, Column, DateTime, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, deferred
 from sqlalchemy.sql import func
 
 from core.database import Base
@@ -21,6 +32,43 @@ class Task(AsyncAttrs, Base):
     description = Column(String(255), nullable=True)
     completed = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=func.clock_timestamp(),
+        onupdate=func.clock_timestamp(),
+        server_default=func.now(),
+        nullable=False,
+    )
+    # Bumped by every UPDATE; conditional updates compare it to detect
+    # concurrent writes without locking the row.
+    version = Column(
+        Integer,
+        default=1,
+        onupdate=literal_column("tasks.version") + 1,
+        server_default="1",
+        nullable=False,
+    )
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    __table_args__ = (
+        Index("ix_tasks_completed_created_at_id", "completed", "created_at", "id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index(
+            "ix_tasks_title_pattern",
+            "title",
+            postgresql_ops={"title": "text_pattern_ops"},
+        ),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     def __eq__(self, other):
         if isinstance(other, dict):
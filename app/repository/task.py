@@ -1,7 +1,14 @@
+from typing import List
+
+from asyncpg.exceptions import UndefinedTableError
+from sqlalchemy import func, select
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.task import Task
+from core.exceptions.base import DatabaseError
 from core.repository.base import BaseRepo
+from core.utils.logging import logger
 
 
 class TaskRepository(BaseRepo[Task]):
@@ -9,5 +16,46 @@ class TaskRepository(BaseRepo[Task]):
     Task repository provides all the database operations for the Task model.
     """
 
+    sortable_fields = ("id", "created_at")
+
     def __init__(self, db_session: AsyncSession):
         super().__init__(model=Task, db_session=db_session)
+
+    async def search(self, text: str, skip: int = 0, limit: int = 100) -> List[Task]:
+        """
+        Full-text search over the title and description of the tasks.
+
+        The query is parsed with `websearch_to_tsquery` (quoted phrases, `or`,
+        `-` exclusion) and matched against the stored, GIN indexed search
+        vector. Matches are ranked by relevance, title matches weighing more
+        than description matches.
+
+        Args:
+            text (str): The search query
+            skip (int): Skip the matches
+            limit (int): Number of matches to fetch in one go
+
+        Raises:
+            DatabaseError: If database query fails
+        """
+        try:
+            ts_query = func.websearch_to_tsquery("english", text)
+            query = (
+                select(Task)
+                .where(Task.search_vector.op("@@")(ts_query))
+                .order_by(func.ts_rank_cd(Task.search_vector, ts_query).desc(), Task.id)
+                .offset(skip)
+                .limit(limit)
+            )
+            result = await self.session.execute(query)
+            return result.scalars().all()
+        except ProgrammingError as e:
+            logger.error(f"Database table does not exist: {e}", exc_info=True)
+            error_code = getattr(e.orig, "sqlstate", None)
+            if error_code == UndefinedTableError.sqlstate:
+                raise DatabaseError("Database table does not exist.") from e
+
+            raise DatabaseError("Database programming error occurred.") from e
+        except SQLAlchemyError as e:
+            logger.error(f"Database error occurred: {e}", exc_info=True)
+            raise DatabaseError("Database error occurred.") from e
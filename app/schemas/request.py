@@ -1,11 +1,16 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing_extensions import Annotated
 
+from core.config import config
+
 
 class TaskCreateRequest(BaseModel):
-    id: Annotated[int, Field(..., description="Task ID", examples=[1], gt=0)]
+    id: Annotated[
+        int, Field(..., description="Task ID", examples=[1], gt=0, lt=2**63)
+    ]
     title: Annotated[
         str,
         Field(
@@ -13,13 +18,17 @@ class TaskCreateRequest(BaseModel):
             description="Title of the Task",
             examples=["Buy Groceries"],
             min_length=1,
+            max_length=255,
         ),
     ]
     description: Optional[str] = Field(
-        None, description="Describe the task", examples=["Milk, Eggs, Bread"]
+        None,
+        description="Describe the task",
+        examples=["Milk, Eggs, Bread"],
+        max_length=255,
     )
-    completed: Optional[bool] = (
-        Field(default=False, description="Task completion status", examples=[False]),
+    completed: bool = Field(
+        default=False, description="Task completion status", examples=[False]
     )
 
     @field_validator("id")
@@ -45,14 +54,20 @@ class TaskCreateRequest(BaseModel):
 class TaskUpdateRequest(BaseModel):
 
     title: Optional[str] = Field(
-        ..., description="Title of the Task", examples=["Buy Groceries"]
+        ...,
+        description="Title of the Task",
+        examples=["Buy Groceries"],
+        max_length=255,
     )
 
     description: Optional[str] = Field(
-        None, description="Describe the task", examples=["Milk, Eggs, Bread"]
+        None,
+        description="Describe the task",
+        examples=["Milk, Eggs, Bread"],
+        max_length=255,
     )
-    completed: Optional[bool] = (
-        Field(default=False, description="Task completion status", examples=[False]),
+    completed: bool = Field(
+        default=False, description="Task completion status", examples=[False]
     )
 
     @field_validator("title")
@@ -64,3 +79,107 @@ class TaskUpdateRequest(BaseModel):
         if not stripped_value:
             raise ValueError("Title cannot be empty or whitespace")
         return stripped_value
+
+
+class TaskBulkCreateRequest(BaseModel):
+    tasks: Annotated[
+        List[TaskCreateRequest],
+        Field(
+            ...,
+            description="Tasks to create",
+            min_length=1,
+            max_length=config.BULK_MAX_ITEMS,
+        ),
+    ]
+
+
+class TaskFilter(BaseModel):
+    completed: Optional[bool] = Field(
+        None, description="Task completion status", examples=[True]
+    )
+    created_before: Optional[datetime] = Field(
+        None,
+        description="Only tasks created before this time",
+        examples=["2024-11-16T14:30:00"],
+    )
+    created_after: Optional[datetime] = Field(
+        None,
+        description="Only tasks created at or after this time",
+        examples=["2024-11-01T00:00:00"],
+    )
+    title_prefix: Optional[str] = Field(
+        None,
+        description="Only tasks whose title starts with this text",
+        examples=["Buy"],
+        min_length=1,
+    )
+
+    def to_filters(self) -> dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "created_at__lt": self.created_before,
+            "created_at__gte": self.created_after,
+            "title__prefix": self.title_prefix,
+        }
+
+
+class TaskSelection(BaseModel):
+    ids: Optional[
+        Annotated[
+            List[Annotated[int, Field(gt=0)]],
+            Field(min_length=1, max_length=config.BULK_MAX_ITEMS),
+        ]
+    ] = Field(None, description="IDs of the tasks", examples=[[1, 2, 3]])
+    filter: Optional[TaskFilter] = Field(
+        None, description="Filter selecting the tasks"
+    )
+
+    @model_validator(mode="after")
+    def validate_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("Filter must have at least one condition")
+        return self
+
+
+class TaskPatch(BaseModel):
+    title: Optional[str] = Field(
+        None,
+        description="Title of the Task",
+        examples=["Buy Groceries"],
+        max_length=255,
+    )
+    description: Optional[str] = Field(
+        None,
+        description="Describe the task",
+        examples=["Milk, Eggs, Bread"],
+        max_length=255,
+    )
+    completed: Optional[bool] = Field(
+        None, description="Task completion status", examples=[True]
+    )
+
+    @field_validator("title")
+    @classmethod
+    def title_not_empty(cls, v: Optional[str]) -> str:
+        if v is None:
+            raise ValueError("Title must not be null")
+        stripped_value = v.strip()
+        if not stripped_value:
+            raise ValueError("Title cannot be empty or whitespace")
+        return stripped_value
+
+    @model_validator(mode="after")
+    def validate_not_empty(self):
+        if not self.model_dump(exclude_unset=True):
+            raise ValueError("No updates provided")
+        return self
+
+
+class TaskBulkUpdateRequest(TaskSelection):
+    values: TaskPatch = Field(..., description="Fields to update")
+
+
+class TaskBulkDeleteRequest(TaskSelection):
+    pass
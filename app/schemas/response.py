@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 from typing_extensions import Annotated
@@ -24,12 +24,132 @@ class TaskResponse(BaseModel):
             examples=["2024-11-16T14:30:00"],
         ),
     ]
+    updated_at: Annotated[
+        Optional[datetime],
+        Field(
+            None,
+            description="Timestamp when the task was last modified",
+            examples=["2024-11-16T14:30:00"],
+        ),
+    ]
+    version: Optional[int] = Field(
+        None, description="Incremented on every update of the task", examples=[1]
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskBulkConflict(BaseModel):
+    index: int = Field(..., description="Position of the task in the request")
+    id: int = Field(..., description="Task ID", examples=[1])
+    detail: str = Field(..., examples=["Unique constraint violation"])
+
+
+class TaskBulkCreateResponse(BaseModel):
+    created: List[TaskResponse] = Field(..., description="Tasks that were created")
+    conflicts: List[TaskBulkConflict] = Field(
+        ..., description="Tasks that were skipped because their ID already exists"
+    )
+
+
+class TaskBulkUpdateResponse(BaseModel):
+    updated: int = Field(..., description="Number of updated tasks", examples=[42])
+
+
+class TaskBulkDeleteResponse(BaseModel):
+    deleted: int = Field(..., description="Number of deleted tasks", examples=[42])
+
+
+class TaskImportError(BaseModel):
+    line: int = Field(..., description="Line of the record in the upload", examples=[3])
+    detail: str = Field(..., examples=["title: Field required"])
+
+
+class TaskImportResponse(BaseModel):
+    processed: int = Field(..., description="Number of records read", examples=[10000])
+    created: int = Field(..., description="Number of tasks created", examples=[9998])
+    failed: int = Field(..., description="Number of records rejected", examples=[2])
+    batches: int = Field(..., description="Number of batches written", examples=[2])
+    errors: List[TaskImportError] = Field(
+        ..., description="Rejected records, up to the configured maximum"
+    )
+    errors_truncated: bool = Field(
+        ..., description="Whether rejected records were left out of `errors`"
+    )
+
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Health status", examples=["healthy"])
     database_connected: bool = Field(
         ..., description="Database connection status", examples=[True]
     )
+
+
+class CacheStatsResponse(BaseModel):
+    size: int = Field(..., description="Number of cached entries", examples=[120])
+    maxsize: int = Field(..., description="Maximum number of entries", examples=[10000])
+    hits: int = Field(..., description="Lookups served from the cache", examples=[950])
+    misses: int = Field(
+        ..., description="Lookups that went to the database", examples=[50]
+    )
+    evictions: int = Field(
+        ..., description="Entries evicted because the cache was full", examples=[0]
+    )
+    expirations: int = Field(
+        ..., description="Entries dropped because they expired", examples=[3]
+    )
+
+
+class PoolStatsResponse(BaseModel):
+    size: int = Field(..., description="Connections kept in the pool", examples=[10])
+    checked_out: int = Field(
+        ..., description="Connections currently in use", examples=[3]
+    )
+    idle: int = Field(
+        ..., description="Open connections waiting in the pool", examples=[7]
+    )
+    overflow: int = Field(
+        ..., description="Connections open beyond the pool size", examples=[0]
+    )
+    max_overflow: int = Field(
+        ..., description="Connections allowed beyond the pool size", examples=[20]
+    )
+    timeout: float = Field(
+        ..., description="Seconds a checkout waits for a connection", examples=[30]
+    )
+    checkouts: int = Field(..., description="Connections checked out", examples=[1200])
+    timeouts: int = Field(
+        ..., description="Checkouts that gave up waiting", examples=[0]
+    )
+    wait_time_total: float = Field(
+        ..., description="Seconds spent acquiring connections", examples=[0.42]
+    )
+    wait_time_avg: float = Field(
+        ..., description="Average seconds to acquire a connection", examples=[0.0004]
+    )
+    wait_time_max: float = Field(
+        ..., description="Longest wait for a connection, in seconds", examples=[0.05]
+    )
+
+
+class LivenessResponse(BaseModel):
+    status: str = Field(..., description="Process status", examples=["alive"])
+
+
+class ReadinessResponse(BaseModel):
+    status: str = Field(
+        ..., description="Readiness status, ready or unavailable", examples=["ready"]
+    )
+    database_connected: bool = Field(
+        ..., description="Whether the last probe reached the database", examples=[True]
+    )
+    latency: Optional[float] = Field(
+        None, description="Duration of the last probe, in seconds", examples=[0.002]
+    )
+    checked_ago: Optional[float] = Field(
+        None, description="Seconds since the last probe", examples=[1.5]
+    )
+    error: Optional[str] = Field(None, description="Error of the last probe")
+    pool: dict[str, PoolStatsResponse] = Field(
+        ..., description="Pool statistics at the last probe"
+    )
@@ -0,0 +1,63 @@
+"""
+Helpers shared by the benchmarks.
+
+The tasks a benchmark seeds are inserted in a transaction that is rolled
+back at the end, so the database configured by the usual environment
+variables is left as it was.
+"""
+
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.repository.task import TaskRepository
+from core.config import config
+
+BASE_ID = 900_000_000
+
+
+@asynccontextmanager
+async def seeded_session(row_count: int) -> AsyncIterator[AsyncSession]:
+    """
+    Yield a session holding `row_count` extra tasks with IDs from `BASE_ID`,
+    which are rolled back on exit.
+    """
+    engine = create_async_engine(config.POSTGRES_URL)
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(bind=connection)
+            try:
+                await TaskRepository(session).bulk_create(
+                    [
+                        {
+                            "id": BASE_ID + i,
+                            "title": f"Task {i}",
+                            "description": "Benchmark",
+                        }
+                        for i in range(row_count)
+                    ]
+                )
+                session.expunge_all()
+                yield session
+            finally:
+                await session.close()
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+async def cpu_time_per_call(
+    call: Callable[[int], Awaitable[Any]], calls: int
+) -> float:
+    """
+    Return the CPU time per awaited `call(i)`, in microseconds, after one
+    warm-up call.
+    """
+    await call(0)
+    start = time.process_time()
+    for i in range(calls):
+        await call(i)
+    return (time.process_time() - start) / calls * 1e6
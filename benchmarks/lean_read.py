@@ -0,0 +1,46 @@
+"""
+CPU spent per row serving a task listing, through ORM instances validated
+by `TaskResponse` versus plain row mappings serialized straight to JSON.
+
+Each round fetches the whole table as one page, so the figures include
+the query and the loading of every row; with the ORM path the identity
+map is emptied after each round so instances are built again.
+
+Usage:
+    python -m benchmarks.lean_read [rows] [rounds]
+"""
+
+import asyncio
+import sys
+
+from app.repository.task import TaskRepository
+from app.schemas.response import TaskResponse
+from benchmarks.common import cpu_time_per_call, seeded_session
+from core.fastapi.responses import list_adapter
+from core.utils.json import dumps_bytes
+
+
+async def main(row_count: int = 1000, rounds: int = 20) -> None:
+    adapter = list_adapter(TaskResponse)
+    async with seeded_session(row_count) as session:
+        repo = TaskRepository(session)
+
+        async def orm_page(_: int) -> None:
+            tasks = await repo.get_all(limit=10**6)
+            adapter.dump_json(adapter.validate_python(tasks, from_attributes=True))
+            session.expunge_all()
+
+        async def rows_page(_: int) -> None:
+            dumps_bytes(await repo.get_all(limit=10**6, as_rows=True))
+
+        rows = len(await repo.get_all(limit=10**6, as_rows=True))
+        orm = await cpu_time_per_call(orm_page, rounds) / rows
+        lean = await cpu_time_per_call(rows_page, rounds) / rows
+        print(f"{'path':<8}{'CPU per row (us)':>18}")
+        print(f"{'orm':<8}{orm:>18.1f}")
+        print(f"{'rows':<8}{lean:>18.1f}")
+        print(f"saved {1 - lean / orm:.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:3])))
@@ -0,0 +1,65 @@
+"""
+Per-request overhead of `SQLAlchemyMiddleware` on a route that never
+touches the database, compared with the previous eager scoping, which
+generated a uuid4 and removed the scoped session on every request.
+
+No database is needed.
+
+Usage:
+    python -m benchmarks.session_middleware [requests]
+"""
+
+import asyncio
+import sys
+from uuid import uuid4
+
+from benchmarks.common import cpu_time_per_call
+from core.database.session import reset_session_context, session, set_session_context
+from core.fastapi.middleware.sqlalchemy import SQLAlchemyMiddleware
+
+
+class EagerSessionMiddleware:
+    """The previous middleware, kept here as the baseline."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        context = set_session_context(session_id=str(uuid4()))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await session.remove()
+            reset_session_context(context=context)
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def measure(app, requests: int) -> float:
+    """Return the CPU time per request, in microseconds."""
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    return await cpu_time_per_call(lambda _: app(scope, receive, send), requests)
+
+
+async def main(requests: int = 100000) -> None:
+    bare = await measure(endpoint, requests)
+    eager = await measure(EagerSessionMiddleware(endpoint), requests)
+    lazy = await measure(SQLAlchemyMiddleware(endpoint), requests)
+    print(f"{'middleware':<12}{'overhead per request (us)':>28}")
+    print(f"{'eager':<12}{eager - bare:>28.2f}")
+    print(f"{'lazy':<12}{lazy - bare:>28.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:2])))
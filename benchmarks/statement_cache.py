@@ -0,0 +1,48 @@
+"""
+CPU spent per request by the `get_by_id` and `get_all` repository calls,
+with and without the `BaseRepo` statement cache.
+
+Without the cache, every call builds its SQLAlchemy construct again and
+SQLAlchemy computes its cache key to find the compiled SQL. Both modes run
+the full call against the database, so the figures include execution and
+result processing.
+
+Usage:
+    python -m benchmarks.statement_cache [calls] [rows]
+"""
+
+import asyncio
+import sys
+
+from app.repository.task import TaskRepository
+from benchmarks.common import BASE_ID, cpu_time_per_call, seeded_session
+
+
+def disable_statement_cache(repo: TaskRepository) -> None:
+    """Make `repo` build its statements on every call."""
+    repo._statement = lambda key, build: build()
+
+
+async def main(calls: int = 2000, row_count: int = 100) -> None:
+    async with seeded_session(row_count) as session:
+        cached = TaskRepository(session)
+        rebuilt = TaskRepository(session)
+        disable_statement_cache(rebuilt)
+
+        def cases(repo: TaskRepository):
+            return {
+                "get_by_id": lambda i: repo.get_by_field(
+                    "id", BASE_ID + i % row_count, as_rows=True
+                ),
+                "get_all": lambda i: repo.get_all(limit=20, as_rows=True),
+            }
+
+        print(f"{'query':<12}{'rebuilt (us)':>14}{'cached (us)':>14}{'saved':>8}")
+        for name, call in cases(rebuilt).items():
+            before = await cpu_time_per_call(call, calls)
+            after = await cpu_time_per_call(cases(cached)[name], calls)
+            print(f"{name:<12}{before:>14.1f}{after:>14.1f}{1 - after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:3])))
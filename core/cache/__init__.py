@@ -0,0 +1,12 @@
+from .invalidation import caches, evict, get_cache, mark_changed
+from .listener import InvalidationListener
+from .ttl import TTLCache
+
+__all__ = [
+    "InvalidationListener",
+    "TTLCache",
+    "caches",
+    "evict",
+    "get_cache",
+    "mark_changed",
+]
@@ -0,0 +1,106 @@
+import json
+from typing import Iterable, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from core.cache.ttl import TTLCache
+from core.config import config
+
+CHANGES_KEY = "changed_ids"
+
+caches: dict[str, TTLCache] = {}
+
+
+def get_cache(name: str) -> TTLCache:
+    """
+    Return the read cache of a table, creating it on first use. Caches are
+    shared by every request of the process.
+    """
+    cache = caches.get(name)
+    if cache is None:
+        cache = caches[name] = TTLCache(
+            maxsize=config.READ_CACHE_SIZE, ttl=config.READ_CACHE_TTL
+        )
+    return cache
+
+
+def mark_changed(session, name: str, ids: Iterable) -> None:
+    """
+    Evict rows of a table written in the current transaction from its read
+    cache, and record them so they are evicted again once it commits, in
+    case a concurrent read cached the previous version in between.
+
+    Args:
+        session: The (async) session the rows were written with
+        name (str): Name of the table
+        ids (Iterable): IDs of the written rows
+    """
+    ids = set(ids)
+    evict({name: ids})
+    session.info.setdefault(CHANGES_KEY, {}).setdefault(name, set()).update(ids)
+
+
+def evict(changes: dict[str, set]) -> None:
+    """
+    Evict the given IDs from the read caches of their tables.
+    """
+    for name, ids in changes.items():
+        cache = caches.get(name)
+        if cache is not None:
+            for id in ids:
+                cache.delete(id)
+
+
+def encode_changes(changes: dict[str, set]) -> list[str]:
+    """
+    Encode changed IDs as NOTIFY payloads of at most
+    `CACHE_INVALIDATION_MAX_IDS` IDs each. Larger sets are sent as a single
+    payload without IDs, which clears the whole cache of the table.
+    """
+    payloads = []
+    for name, ids in changes.items():
+        ids = sorted(ids)
+        if len(ids) > config.CACHE_INVALIDATION_MAX_IDS:
+            payloads.append(json.dumps({"table": name, "ids": None}))
+            continue
+        payloads.append(json.dumps({"table": name, "ids": ids}))
+    return payloads
+
+
+def apply_payload(payload: str) -> None:
+    """
+    Evict the entries named by a payload produced by `encode_changes`.
+    """
+    message = json.loads(payload)
+    ids: Optional[list] = message["ids"]
+    if ids is None:
+        cache = caches.get(message["table"])
+        if cache is not None:
+            cache.clear()
+        return
+    evict({message["table"]: set(ids)})
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_changes(session: Session) -> None:
+    changes = session.info.get(CHANGES_KEY)
+    if not changes or not config.CACHE_INVALIDATION_CHANNEL:
+        return
+    # NOTIFY is transactional: other workers are told only once the writes
+    # are committed, and nothing is sent if the transaction rolls back.
+    for payload in encode_changes(changes):
+        session.execute(
+            select(func.pg_notify(config.CACHE_INVALIDATION_CHANNEL, payload)),
+            bind_arguments={"writer": True},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session: Session) -> None:
+    evict(session.info.pop(CHANGES_KEY, {}))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(CHANGES_KEY, None)
@@ -0,0 +1,89 @@
+import asyncio
+from typing import Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from core.cache.invalidation import apply_payload, caches
+from core.config import config
+from core.utils.logging import logger
+
+
+class InvalidationListener:
+    """
+    Keep a dedicated connection listening on the cache invalidation channel
+    and evict the entries other workers report as changed.
+
+    The connection is re-established when it drops. Notifications sent while
+    it was down are lost, so every cache is cleared on reconnect.
+    """
+
+    def __init__(
+        self,
+        dsn: str = config.POSTGRES_URL,
+        channel: str = config.CACHE_INVALIDATION_CHANNEL,
+        retry_interval: float = 5.0,
+    ):
+        """
+        Args:
+            dsn (str): SQLAlchemy URL of the database
+            channel (str): Name of the NOTIFY channel
+            retry_interval (float): Seconds to wait before reconnecting
+        """
+        self.dsn = make_url(str(dsn)).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self.channel = channel
+        self.retry_interval = retry_interval
+        self.listening = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Start listening in the background. Does nothing if no channel is
+        configured.
+        """
+        if self.channel and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop listening and close the connection.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _notify(self, connection, pid, channel, payload) -> None:
+        try:
+            apply_payload(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed invalidation payload: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning(f"Cache invalidation listener cannot connect: {e}")
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            try:
+                await connection.add_listener(self.channel, self._notify)
+                for cache in caches.values():
+                    cache.clear()
+                self.listening.set()
+                logger.info(f"Listening for cache invalidations on '{self.channel}'")
+                await closed.wait()
+                logger.warning("Cache invalidation listener connection lost")
+            finally:
+                self.listening.clear()
+                await connection.close()
+            await asyncio.sleep(self.retry_interval)
@@ -13,6 +13,25 @@ class EnvironmentType(str, Enum):
     TEST = "test"
 
 
+def pool_overrides(role: str) -> dict:
+    """
+    Read the pool parameters overridden for the `role` engine from the
+    environment, e.g. `DB_READER_POOL_SIZE`.
+    """
+    parsers = {
+        "pool_size": int,
+        "max_overflow": int,
+        "pool_timeout": float,
+        "pool_recycle": int,
+    }
+    overrides = {}
+    for name, parse in parsers.items():
+        value = os.getenv(f"DB_{role.upper()}_{name.upper()}")
+        if value is not None:
+            overrides[name] = parse(value)
+    return overrides
+
+
 def create_postgres_url():
     scheme = "postgresql+asyncpg"
     username = os.getenv("user", "postgres")
@@ -29,7 +48,54 @@ class Config:
     DEFAULT_LOCALE: str = "en_US"
     ENVIRONMENT: str = EnvironmentType.DEVELOPMENT
     POSTGRES_URL: PostgresDsn = create_postgres_url()
+    POSTGRES_REPLICA_URLS: list[str] = [
+        url.strip()
+        for url in os.getenv("POSTGRES_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    DB_POOL: dict = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "3600")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+    DB_POOL_OVERRIDES: dict[str, dict] = {
+        "writer": pool_overrides("writer"),
+        "reader": pool_overrides("reader"),
+    }
+    REPLICA_BALANCING: str = os.getenv("REPLICA_BALANCING", "round_robin")
+    REPLICA_MAX_LAG: float = float(os.getenv("REPLICA_MAX_LAG", "5"))
+    REPLICA_CHECK_INTERVAL: float = 5.0
+    READ_YOUR_WRITES_COOKIE: str = "db_primary"
+    READ_YOUR_WRITES_WINDOW: int = int(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
     APIPORT: int = 8000
+    BULK_MAX_ITEMS: int = 10000
+    BULK_COPY_THRESHOLD: int = 1000
+    BULK_CHUNK_SIZE: int = 1000
+    EXPORT_FETCH_SIZE: int = 1000
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 1000
+    COUNT_CACHE_SIZE: int = 1024
+    COUNT_CACHE_TTL: int = 10
+    QUERY_CACHE_SIZE: int = 1200
+    PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    READ_CACHE_ENABLED: bool = os.getenv("READ_CACHE_ENABLED", "true").lower() == "true"
+    READ_CACHE_SIZE: int = int(os.getenv("READ_CACHE_SIZE", "10000"))
+    READ_CACHE_TTL: float = float(os.getenv("READ_CACHE_TTL", "60"))
+    CACHE_INVALIDATION_CHANNEL: str = os.getenv(
+        "CACHE_INVALIDATION_CHANNEL", "cache_invalidation"
+    )
+    CACHE_INVALIDATION_MAX_IDS: int = 500
+    HEALTH_PROBE_INTERVAL: float = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+    HEALTH_PROBE_TIMEOUT: float = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+    SERVER_TIMING_ENABLED: bool = (
+        os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+    )
+    SLOW_QUERY_THRESHOLD: float = float(os.getenv("SLOW_QUERY_THRESHOLD", "0.5"))
+    SLOW_QUERY_EXPLAIN_RATE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0"))
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6
 
 
 config: Config = Config()
@@ -1,9 +1,31 @@
-from typing import Any, Generic, Type, TypeVar
+import csv
+import io
+from collections.abc import Mapping
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Generic,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
 from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import NoResultFound
 
+from core.cache import get_cache
+from core.config import config
 from core.database import Base, Propagation, Transactional
-from core.exceptions.base import NotFoundException, UnprocessableEntity, InternalServerError,DatabaseError
+from core.exceptions.base import NotFoundException, InternalServerError,DatabaseError, BadRequestException
 from core.repository.base import BaseRepo
+from core.repository.cursor import decode_cursor, encode_cursor
+from core.utils.json import dumps
+from core.utils.logging import logger
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -19,6 +41,8 @@ class BaseController(Generic[ModelType]):
     Attributes:
         model_class (Type[ModelType]): The SQLAlchemy model class
         repository (BaseRepo): The repository instance for database operations
+        cache (Optional[TTLCache]): Read cache of rows by ID, shared by the
+            process and invalidated when a write commits. None when disabled
 
     Type Parameters:
         ModelType: A TypeVar bound to Base, representing the model type
@@ -34,6 +58,9 @@ class BaseController(Generic[ModelType]):
         """
         self.model_class = model
         self.repository = repository
+        self.cache = (
+            get_cache(model.__tablename__) if config.READ_CACHE_ENABLED else None
+        )
 
     @Transactional(propagation=Propagation.REQUIRED)
     async def create(self, attributes: dict[str, Any]) -> ModelType:
@@ -50,7 +77,8 @@ class BaseController(Generic[ModelType]):
             ModelType: The newly created model instance
 
         Raises:
-            UnprocessableEntity: If the attributes are invalid
+            UnprocessableEntity: Raised by the repository on a unique or
+                not-null constraint violation
             DatabaseError: If there's an error during database operation
         """
         try:
@@ -59,34 +87,331 @@ class BaseController(Generic[ModelType]):
         except DatabaseError as e:
             raise InternalServerError from e
 
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def upsert(
+        self, attributes: dict[str, Any], on_conflict: str = "update"
+    ) -> tuple[ModelType, bool]:
+        """
+        Create a model instance, or resolve an existing instance with the same
+        ID without raising. The operation is wrapped in a transaction.
+
+        Args:
+            attributes (dict[str, Any]): Dictionary of model attributes, including the ID
+            on_conflict (str, optional): "update" replaces the existing instance,
+                "ignore" keeps it. Defaults to "update"
+
+        Returns:
+            tuple[ModelType, bool]: The stored instance and whether it was created
+
+        Raises:
+            UnprocessableEntity: Raised by the repository on a not-null
+                constraint violation
+            InternalServerError: If there's an error during database operation
+        """
+        try:
+            return await self.repository.upsert(attributes, on_conflict=on_conflict)
+        except DatabaseError as e:
+            raise InternalServerError from e
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def bulk_create(self, attributes_list: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Create many instances of the model in the database at once.
+
+        The whole batch is written with a single statement (or COPY for large
+        batches) in one transaction. Instances whose ID already exists are
+        reported back as conflicts instead of failing the batch.
+
+        Args:
+            attributes_list (list[dict[str, Any]]): Attributes of each instance
+
+        Returns:
+            dict[str, Any]: The created instances under `created` and the
+                conflicting entries (`index`, `id`, `detail`) under `conflicts`
+
+        Raises:
+            InternalServerError: If there's an error during database operation
+        """
+        try:
+            created, conflicts = await self.repository.bulk_create(attributes_list)
+        except DatabaseError as e:
+            raise InternalServerError from e
+        return {
+            "created": created,
+            "conflicts": [
+                {
+                    "index": index,
+                    "id": attributes_list[index]["id"],
+                    "detail": "Unique constraint violation",
+                }
+                for index in conflicts
+            ],
+        }
+
+    async def import_records(
+        self,
+        records: AsyncIterator[tuple[int, Any]],
+        schema: Type[BaseModel],
+    ) -> dict[str, Any]:
+        """
+        Import a stream of parsed records.
+
+        Records are validated against `schema` and written `IMPORT_BATCH_SIZE`
+        at a time through COPY, each batch committed in its own transaction.
+        Only one batch is held in memory, whatever the size of the upload.
+        Invalid and conflicting records are reported by line number instead
+        of failing the import; a batch the database rejects is written again
+        row by row so that only the rejected records fail.
+
+        Args:
+            records (AsyncIterator[tuple[int, Any]]): Line numbers with either a
+                parsed record or the error raised while parsing it
+            schema (Type[BaseModel]): Schema validating each record
+
+        Returns:
+            dict[str, Any]: The import report with the `processed`, `created`,
+                `failed` and `batches` counters and the per-line `errors`
+
+        Raises:
+            InternalServerError: If there's an error during database operation
+        """
+        report = {
+            "processed": 0,
+            "created": 0,
+            "failed": 0,
+            "batches": 0,
+            "errors": [],
+            "errors_truncated": False,
+        }
+
+        def add_error(line: int, detail: str) -> None:
+            report["failed"] += 1
+            if len(report["errors"]) < config.IMPORT_MAX_ERRORS:
+                report["errors"].append({"line": line, "detail": detail})
+            else:
+                report["errors_truncated"] = True
+
+        @Transactional(propagation=Propagation.REQUIRED)
+        async def write_batch(
+            rows: list[dict[str, Any]], copy: bool = True
+        ) -> tuple[list, list[int]]:
+            # The savepoint keeps the session usable when the rows are rejected
+            async with self.repository.session.begin_nested():
+                return await self.repository.bulk_create(rows, copy=copy)
+
+        def rejected(error: DatabaseError) -> Optional[str]:
+            # Data exceptions (class 22) and constraint violations (class 23)
+            # are caused by the rows, anything else by the database
+            orig = getattr(error.__cause__, "orig", None)
+            if (getattr(orig, "sqlstate", None) or "")[:2] not in ("22", "23"):
+                return None
+            detail = str(orig)
+            if detail.startswith("<class"):
+                detail = detail.split(": ", 1)[-1]
+            return detail
+
+        async def write_rows(lines: list[int], rows: list[dict[str, Any]]) -> None:
+            # A row the database rejects fails its whole batch; write the
+            # batch again row by row to report the rejected lines.
+            for line, row in zip(lines, rows):
+                try:
+                    created, conflicts = await write_batch([row], copy=False)
+                except DatabaseError as e:
+                    detail = rejected(e)
+                    if detail is None:
+                        raise InternalServerError from e
+                    add_error(line, detail)
+                    continue
+                report["created"] += len(created)
+                if conflicts:
+                    add_error(line, "Unique constraint violation")
+
+        async def flush(lines: list[int], rows: list[dict[str, Any]]) -> None:
+            try:
+                created, conflicts = await write_batch(rows)
+            except DatabaseError as e:
+                if rejected(e) is None:
+                    raise InternalServerError from e
+                await write_rows(lines, rows)
+            else:
+                report["created"] += len(created)
+                for index in conflicts:
+                    add_error(lines[index], "Unique constraint violation")
+            report["batches"] += 1
+            logger.info(
+                f"Imported batch {report['batches']} into "
+                f"{self.model_class.__tablename__}: {report['processed']} "
+                f"processed, {report['created']} created, {report['failed']} failed"
+            )
+
+        lines, rows = [], []
+        async for line, record in records:
+            report["processed"] += 1
+            if isinstance(record, Exception):
+                add_error(line, str(record))
+                continue
+            try:
+                rows.append(schema.model_validate(record).model_dump())
+                lines.append(line)
+            except ValidationError as e:
+                add_error(
+                    line,
+                    "; ".join(
+                        f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                        for error in e.errors()
+                    ),
+                )
+            if len(rows) >= config.IMPORT_BATCH_SIZE:
+                await flush(lines, rows)
+                lines, rows = [], []
+        if rows:
+            await flush(lines, rows)
+        return report
+
     async def get_all(
         self,
         skip: int = 0,
         limit: int = 100,
+        after: Optional[str] = None,
+        sort: str = "id",
+        filters: Optional[dict[str, Any]] = None,
+        as_rows: bool = False,
     ) -> list[ModelType]:
         """
-        Retrieve a paginated list of model instances.
+        Retrieve a filtered, sorted and paginated list of model instances.
 
-        This method returns a list of model instances with pagination support
-        and optional joining of related models.
+        This method returns a list of model instances with pagination support.
+        Pages can be addressed either by offset (`skip`) or by the opaque
+        cursor returned by `next_cursor` for the previous page (`after`).
 
         Args:
             skip (int, optional): Number of records to skip. Defaults to 0
             limit (int, optional): Maximum number of records to return. Defaults to 100
+            after (Optional[str], optional): Cursor of the previous page. Defaults to None
+            sort (str, optional): Field to sort by, "-" prefixed for descending order.
+                Defaults to "id"
+            filters (Optional[dict[str, Any]], optional): Filter selecting the records.
+                Defaults to None
+            as_rows (bool, optional): Return read-only row mappings instead of
+                model instances. Defaults to False
 
         Returns:
-            list[ModelType]: List of model instances
+            list[ModelType]: List of model instances (or row mappings)
 
         Raises:
+            BadRequestException: If the cursor, sort or filters are invalid
             DatabaseError: If there's an error during database operation
         """
+        position = None
+        if after is not None:
+            if skip:
+                raise BadRequestException("Cannot combine skip with a cursor")
+            cursor_sort, value, last_id = decode_cursor(after)
+            if cursor_sort != sort:
+                raise BadRequestException("Cursor does not match the requested sort")
+            position = (value, last_id)
         try:
-            response = await self.repository.get_all(skip, limit)
+            response = await self.repository.get_all(
+                skip, limit, after=position, sort=sort, filters=filters, as_rows=as_rows
+            )
             return response
+        except ValueError as e:
+            raise BadRequestException(str(e)) from e
+        except DatabaseError as e:
+            raise InternalServerError from e
+
+    async def count(
+        self, filters: Optional[dict[str, Any]] = None, mode: str = "exact"
+    ) -> int:
+        """
+        Count the model instances matching a filter.
+
+        Args:
+            filters (Optional[dict[str, Any]], optional): Filter selecting the records.
+                Defaults to None
+            mode (str, optional): "exact", "estimate" or "cached". Defaults to "exact"
+
+        Returns:
+            int: The (possibly estimated) number of matching instances
+
+        Raises:
+            BadRequestException: If the mode or filters are invalid
+            DatabaseError: If there's an error during database operation
+        """
+        try:
+            return await self.repository.count(filters=filters, mode=mode)
+        except ValueError as e:
+            raise BadRequestException(str(e)) from e
         except DatabaseError as e:
             raise InternalServerError from e
 
-    async def get_by_id(self, id: int) -> ModelType:
+    def next_cursor(
+        self, items: list[ModelType], limit: int, sort: str = "id"
+    ) -> Optional[str]:
+        """
+        Build the cursor pointing past the last item of a page.
+
+        Args:
+            items (list[ModelType]): The page returned by `get_all`, as
+                instances or row mappings
+            limit (int): The page size that was requested
+            sort (str): The sort the page was requested with
+
+        Returns:
+            Optional[str]: The cursor of the next page, or None if the page
+                was the last one
+        """
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        if isinstance(last, Mapping):
+            return encode_cursor(sort, last[sort.lstrip("-")], last["id"])
+        return encode_cursor(sort, getattr(last, sort.lstrip("-")), last.id)
+
+    async def export(
+        self, format: str, filters: Optional[dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Export every model instance as NDJSON or CSV.
+
+        Rows are streamed from the database `EXPORT_FETCH_SIZE` at a time and
+        encoded batch by batch, so memory use stays constant whatever the
+        size of the table.
+
+        Args:
+            format (str): Either "ndjson" or "csv"
+            filters (Optional[dict[str, Any]]): Filter selecting the instances
+
+        Yields:
+            str: The next chunk of the export
+
+        Raises:
+            InternalServerError: If there's an error during database operation
+        """
+        columns = [column.name for column in self.repository.columns]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if format == "csv":
+            writer.writerow(columns)
+            yield buffer.getvalue()
+
+        try:
+            async for rows in self.repository.stream_all(
+                filters=filters, fetch_size=config.EXPORT_FETCH_SIZE
+            ):
+                if format == "csv":
+                    buffer.seek(0)
+                    buffer.truncate()
+                    writer.writerows(
+                        [row[column] for column in columns] for row in rows
+                    )
+                    yield buffer.getvalue()
+                else:
+                    yield "".join(f"{dumps(dict(row))}\n" for row in rows)
+        except DatabaseError as e:
+            raise InternalServerError from e
+
+    async def get_by_id(self, id: int, as_rows: bool = False) -> ModelType:
         """
         Retrieve a single model instance by its ID.
 
@@ -95,6 +420,9 @@ class BaseController(Generic[ModelType]):
 
         Args:
             id (int): The unique identifier of the model instance
+            as_rows (bool, optional): Return a read-only row mapping instead of
+                a model instance, served from the read cache when enabled and
+                read from the writer on a miss. Defaults to False
 
         Returns:
             ModelType: The found model instance
@@ -103,15 +431,27 @@ class BaseController(Generic[ModelType]):
             NotFoundException: If no instance is found with the given ID
             DatabaseError: If there's an error during database operation
         """
+        cached = as_rows and self.cache is not None
+        if cached:
+            db_obj = self.cache.get(id)
+            if db_obj is not None:
+                return db_obj
+            generation = self.cache.generation
         try:
+            # Fill the cache from the writer: a row read from a lagging
+            # replica could outlive the eviction that follows its update.
             db_obj = await self.repository.get_by_field(
             field="id",
             value=id,
+            as_rows=as_rows,
+            writer=cached,
             )
             if not db_obj:
                 raise NotFoundException(
                     f"{self.model_class.__tablename__.title()} with id: {id} does not exist"
                 )
+            if cached:
+                self.cache.set(id, db_obj, generation=generation)
             return db_obj
         except DatabaseError as e:
             raise InternalServerError from e
@@ -121,72 +461,161 @@ class BaseController(Generic[ModelType]):
         self,
         id: int,
         attributes: dict[str, Any],
+        expected_version: Optional[Union[int, Collection[int]]] = None,
     ) -> ModelType:
         """
         Update an existing model instance.
 
         This method updates an existing record in the database with the provided
-        attributes. The operation is wrapped in a transaction.
+        attributes using a single UPDATE ... RETURNING statement. The operation
+        is wrapped in a transaction.
 
         Args:
             id (int): The unique identifier of the model instance to update
             attributes (dict[str, Any]): Dictionary of attributes to update
-            join_ (Set[str], optional): Set of relationship names to join. Defaults to None
+            expected_version (Optional[Union[int, Collection[int]]], optional):
+                Only update the instance if it still has this version, or one
+                of these versions. Defaults to None
 
         Returns:
             ModelType: The updated model instance
 
         Raises:
             NotFoundException: If no instance is found with the given ID
-            UnprocessableEntity: If no updates are provided or if updates are invalid
+            PreconditionFailedException: If the instance has another version
+            UnprocessableEntity: Raised by the repository when the attributes
+                change nothing
             DatabaseError: If there's an error during database operation
         """
         try:
-            db_obj = await self.get_by_id(id)
-            if not db_obj:
-                raise NotFoundException(
-                    f"{self.model_class.__tablename__.title()} with id: {id} does not exist"
-                )
-
-             
-            if db_obj == attributes:
-                raise UnprocessableEntity("No updates provided")
-
-            await self.repository.update_by_id(
-                id=id, params=attributes, synchronize_session="evaluate"
+            return await self.repository.update_by_id(
+                id=id,
+                params=attributes,
+                changed_only=True,
+                expected_version=expected_version,
             )
-            ab= await self.get_by_id(id)
-            
-            await self.repository.refresh(ab)
-            return ab
+        except NoResultFound as e:
+            raise NotFoundException(
+                f"{self.model_class.__tablename__.title()} with id: {id} does not exist"
+            ) from e
         except DatabaseError as e:
             raise InternalServerError from e
-        
+
+    async def update_many(
+        self,
+        attributes: dict[str, Any],
+        ids: Optional[list[int]] = None,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> int:
+        """
+        Update every model instance matching an ID list or a filter.
+
+        The set is processed in chunks of `BULK_CHUNK_SIZE` rows, each written
+        by a single statement and committed in its own transaction so row
+        locks are held only briefly.
+
+        Args:
+            attributes (dict[str, Any]): Dictionary of attributes to update
+            ids (Optional[list[int]]): IDs of the instances to update
+            filters (Optional[dict[str, Any]]): Filter selecting the instances
+                to update, used when `ids` is not given
+
+        Returns:
+            int: Number of updated instances
+
+        Raises:
+            DatabaseError: If there's an error during database operation
+        """
+
+        @Transactional(propagation=Propagation.REQUIRED)
+        async def update_chunk(**selection) -> list[int]:
+            return await self.repository.update_many(attributes, **selection)
+
+        return await self._write_in_chunks(update_chunk, ids, filters)
+
     @Transactional(propagation=Propagation.REQUIRED)
-    async def delete(self, id: int) -> bool:
+    async def delete(self, id: int) -> int:
         """
         Delete a model instance by its ID.
 
-        This method attempts to delete a record from the database. The operation
-        is wrapped in a transaction.
+        This method deletes a record with a single statement, without reading
+        it first. The operation is wrapped in a transaction.
 
         Args:
             id (int): The unique identifier of the model instance to delete
 
         Returns:
-            bool: True if deletion was successful, False otherwise
+            int: The ID of the deleted instance
 
         Raises:
             NotFoundException: If no instance is found with the given ID
             DatabaseError: If there's an error during database operation
         """
         try:
-            db_obj = await self.get_by_id(id)
-            if not db_obj:
-                raise NotFoundException(
-                    f"{self.model_class.__tablename__.title()} with id: {id} does not exist"
-                )
-            delete = await self.repository.delete_by_id(id=id)
-            return delete
+            return await self.repository.delete_by_id(id=id)
+        except NoResultFound as e:
+            raise NotFoundException(
+                f"{self.model_class.__tablename__.title()} with id: {id} does not exist"
+            ) from e
         except DatabaseError as e:
-            raise InternalServerError from e
\ No newline at end of file
+            raise InternalServerError from e
+
+    async def delete_many(
+        self,
+        ids: Optional[list[int]] = None,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> int:
+        """
+        Delete every model instance matching an ID list or a filter.
+
+        The set is processed in chunks of `BULK_CHUNK_SIZE` rows, each written
+        by a single statement and committed in its own transaction so row
+        locks are held only briefly.
+
+        Args:
+            ids (Optional[list[int]]): IDs of the instances to delete
+            filters (Optional[dict[str, Any]]): Filter selecting the instances
+                to delete, used when `ids` is not given
+
+        Returns:
+            int: Number of deleted instances
+
+        Raises:
+            DatabaseError: If there's an error during database operation
+        """
+
+        @Transactional(propagation=Propagation.REQUIRED)
+        async def delete_chunk(**selection) -> list[int]:
+            return await self.repository.delete_many(**selection)
+
+        return await self._write_in_chunks(delete_chunk, ids, filters)
+
+    async def _write_in_chunks(
+        self,
+        write: Callable[..., Awaitable[list[int]]],
+        ids: Optional[list[int]],
+        filters: Optional[dict[str, Any]],
+    ) -> int:
+        """
+        Run a set-based write chunk by chunk and return the number of affected
+        instances. ID lists are sliced; filtered sets are walked in ID order.
+        """
+        chunk_size = config.BULK_CHUNK_SIZE
+        affected = 0
+        try:
+            if ids is not None:
+                unique_ids = sorted(set(ids))
+                for start in range(0, len(unique_ids), chunk_size):
+                    chunk = unique_ids[start : start + chunk_size]
+                    affected += len(await write(ids=chunk))
+                return affected
+
+            after = None
+            while True:
+                written = await write(filters=filters, after=after, limit=chunk_size)
+                if not written:
+                    return affected
+                affected += len(written)
+                after = max(written)
+        except DatabaseError as e:
+            raise InternalServerError from e
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from core.config import config
+from core.database.session import engines, get_pool_stats
+from core.utils.logging import logger
+
+
+class HealthProber:
+    """
+    Check the database on a fixed interval in the background and keep the
+    outcome, so that readiness probes answer from memory instead of each
+    taking a connection from the pool.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        """
+        Args:
+            interval (float): Seconds between two probes
+            timeout (float): Seconds a probe may take before the database
+                is considered down
+        """
+        self.interval = interval
+        self.timeout = timeout
+        self.database_connected = False
+        self.latency: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.pool: dict = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the last probe reached the database and is recent enough to
+        be trusted, i.e. no older than three intervals.
+        """
+        return (
+            self.database_connected
+            and self.checked_at is not None
+            and time.monotonic() - self.checked_at <= 3 * self.interval
+        )
+
+    async def probe(self) -> None:
+        """
+        Run `SELECT 1` on the writer and record the outcome, its latency and
+        the pool statistics.
+        """
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with engines["writer"].connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+        except Exception as e:
+            if self.database_connected:
+                logger.error(f"Database health probe failed: {e!r}")
+            self.database_connected = False
+            self.error = repr(e)
+        else:
+            self.database_connected = True
+            self.error = None
+        self.latency = time.perf_counter() - start
+        self.pool = get_pool_stats()
+        self.checked_at = time.monotonic()
+
+    def status(self) -> dict:
+        """Report the outcome of the last probe."""
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "database_connected": self.database_connected,
+            "latency": self.latency,
+            "checked_ago": (
+                None if self.checked_at is None else time.monotonic() - self.checked_at
+            ),
+            "error": self.error,
+            "pool": self.pool,
+        }
+
+    async def start(self) -> None:
+        """Probe once, then keep probing in the background."""
+        if self._task is None:
+            await self.probe()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop probing."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.probe()
+
+
+prober = HealthProber(
+    interval=config.HEALTH_PROBE_INTERVAL, timeout=config.HEALTH_PROBE_TIMEOUT
+)
@@ -0,0 +1,65 @@
+import time
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool recording how long checkouts wait for a connection,
+    including the time to open one when the pool grows, and how many
+    give up after `pool_timeout`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_time += elapsed
+            if elapsed > self.max_wait_time:
+                self.max_wait_time = elapsed
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """
+    Report the occupancy and the checkout waits of the pool of `engine`.
+
+    Args:
+        engine (AsyncEngine): The engine
+
+    Returns:
+        dict: Pool size, checked out, idle and overflow connections, plus
+            the checkout wait figures when the pool is an InstrumentedPool
+    """
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+    }
+    if isinstance(pool, InstrumentedPool):
+        stats.update(
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_time_total=pool.wait_time,
+            wait_time_avg=pool.wait_time / pool.checkouts if pool.checkouts else 0.0,
+            wait_time_max=pool.max_wait_time,
+        )
+    return stats
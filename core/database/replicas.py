@@ -0,0 +1,151 @@
+import asyncio
+import itertools
+from typing import List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.utils.logging import logger
+
+# Replay lag in seconds; zero on a primary and on a replica that has replayed
+# everything it received, so an idle primary does not make it look behind.
+LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class Replica:
+    """
+    A read replica and the health state the balancer routes on.
+    """
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.lag = 0.0
+        event.listen(engine.sync_engine, "handle_error", self._handle_error)
+
+    def _handle_error(self, context) -> None:
+        if context.is_disconnect:
+            logger.warning(f"Ejecting replica {self.name} after a lost connection")
+            self.healthy = False
+
+    @property
+    def connections(self) -> int:
+        """Number of connections currently checked out of the pool."""
+        return self.engine.pool.checkedout()
+
+
+class ReplicaSet:
+    """
+    Balance reads over a set of replicas, round-robin or to the replica with
+    the fewest checked out connections.
+
+    A background check measures the replay lag of each replica. Replicas
+    that fail the check, lose a connection or lag more than `max_lag`
+    seconds are skipped until a later check finds them fit again.
+    """
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        balancing: str = "round_robin",
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+        check_timeout: float = 2.0,
+    ):
+        """
+        Args:
+            engines (List[AsyncEngine]): Engines of the replicas
+            balancing (str): "round_robin" or "least_connections"
+            max_lag (float): Replay lag above which a replica is skipped, in seconds
+            check_interval (float): Seconds between two health checks
+            check_timeout (float): Seconds a health check may take
+
+        Raises:
+            ValueError: If the balancing strategy is not supported
+        """
+        if balancing not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unsupported replica balancing: {balancing}")
+        self.replicas = [
+            Replica(f"reader-{index}", engine) for index, engine in enumerate(engines)
+        ]
+        self.balancing = balancing
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def available(self) -> List[Replica]:
+        """Replicas that are healthy and within the lag threshold."""
+        return [
+            replica
+            for replica in self.replicas
+            if replica.healthy and replica.lag <= self.max_lag
+        ]
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """
+        Pick the engine of the next read.
+
+        Returns:
+            Optional[AsyncEngine]: The engine, or None if no replica is available
+        """
+        replicas = self.available()
+        if not replicas:
+            return None
+        if self.balancing == "least_connections":
+            return min(replicas, key=lambda replica: replica.connections).engine
+        return replicas[next(self._counter) % len(replicas)].engine
+
+    async def check(self) -> None:
+        """
+        Measure the replay lag of every replica, marking the ones that cannot
+        answer unhealthy.
+        """
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                async with replica.engine.connect() as connection:
+                    lag = float((await connection.execute(LAG_QUERY)).scalar())
+        except (SQLAlchemyError, OSError, TimeoutError) as e:
+            if replica.healthy:
+                logger.warning(f"Ejecting replica {replica.name}: {e}")
+            replica.healthy = False
+            return
+        if lag > self.max_lag and replica.lag <= self.max_lag:
+            logger.warning(f"Replica {replica.name} is {lag:.1f}s behind, skipping it")
+        if not replica.healthy:
+            logger.info(f"Replica {replica.name} is back")
+        replica.healthy = True
+        replica.lag = lag
+
+    async def start(self) -> None:
+        """Start checking the replicas in the background."""
+        if self.replicas and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background checks."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
@@ -1,8 +1,9 @@
 from contextvars import ContextVar, Token
-from typing import Union
+from typing import Hashable, Union
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
     create_async_engine,
@@ -11,16 +12,37 @@ from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.sql.expression import Delete, Insert, Update
 
 from core.config import config
+from core.database.pool import InstrumentedPool, pool_stats
+from core.database.replicas import ReplicaSet
+from core.database.timing import instrument_engine
+from core.metrics import register_pool_metrics
 from core.utils.logging import logger
 
-session_context: ContextVar[str] = ContextVar("session_context")
+session_context: ContextVar[Hashable] = ContextVar("session_context")
 
 
-def get_session_context() -> str:
+class RequestScope:
+    """
+    Identity of the session of a request, also carrying its read-your-writes
+    state: `prefer_writer` sends every read of the request to the writer and
+    `wrote` records that the request wrote. `queries` and `db_time` add up
+    the statements the request ran and the seconds they took.
+    """
+
+    __slots__ = ("prefer_writer", "wrote", "queries", "db_time")
+
+    def __init__(self, prefer_writer: bool = False):
+        self.prefer_writer = prefer_writer
+        self.wrote = False
+        self.queries = 0
+        self.db_time = 0.0
+
+
+def get_session_context() -> Hashable:
     return session_context.get()
 
 
-def set_session_context(session_id: str) -> Token:
+def set_session_context(session_id: Hashable) -> Token:
     return session_context.set(session_id)
 
 
@@ -28,34 +50,91 @@ def reset_session_context(context: Token) -> None:
     session_context.reset(context)
 
 
-engines = {
-    "writer": create_async_engine(
-        config.POSTGRES_URL,
-        pool_size=10,
-        max_overflow=20,
-        pool_pre_ping=True,
-        pool_recycle=3600,
-        echo=False,
-    ),
-    "reader": create_async_engine(
-        config.POSTGRES_URL,
-        pool_size=10,
-        max_overflow=20,
-        pool_pre_ping=True,
-        pool_recycle=3600,
+def record_statement(elapsed: float) -> None:
+    """
+    Add a statement that took `elapsed` seconds to the figures of the
+    current request.
+    """
+    scope = session_context.get(None)
+    if isinstance(scope, RequestScope):
+        scope.queries += 1
+        scope.db_time += elapsed
+
+
+def create_engine(url: str, role: str) -> AsyncEngine:
+    """
+    Create the engine of the `role` ("writer" or "reader") pool, from the
+    pool parameters in `config.DB_POOL` and the overrides for the role.
+    """
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        **{**config.DB_POOL, **config.DB_POOL_OVERRIDES.get(role, {})},
+        query_cache_size=config.QUERY_CACHE_SIZE,
+        connect_args={
+            "prepared_statement_cache_size": config.PREPARED_STATEMENT_CACHE_SIZE
+        },
         echo=False,
-    ),
-}
+    )
+    instrument_engine(engine, role, record_statement)
+    return engine
+
+
+engines = {"writer": create_engine(config.POSTGRES_URL, "writer")}
+replicas = ReplicaSet(
+    [create_engine(url, "reader") for url in config.POSTGRES_REPLICA_URLS],
+    balancing=config.REPLICA_BALANCING,
+    max_lag=config.REPLICA_MAX_LAG,
+    check_interval=config.REPLICA_CHECK_INTERVAL,
+)
+engines["reader"] = (
+    replicas.replicas[0].engine if replicas.replicas else engines["writer"]
+)
+
+
+def get_pool_stats() -> dict[str, dict]:
+    """
+    Report the pool of the writer and of each replica.
+    """
+    return {
+        "writer": pool_stats(engines["writer"]),
+        **{replica.name: pool_stats(replica.engine) for replica in replicas.replicas},
+    }
+
+
+register_pool_metrics(get_pool_stats)
 
 
 class RoutingSession(Session):
-    def get_bind(self, mapper=None, clause=None, **kw):
+    def get_bind(
+        self, mapper=None, clause=None, writer=False, replica=True, **kw
+    ):
         """
-        select the Read or write engine based on the query type
+        select the Read or write engine based on the query type, or the write
+        engine when `bind_arguments={"writer": True}` is given.
+
+        Once a session has written, its reads stay on the writer so they see
+        their own writes; so do all reads of a request whose scope prefers
+        the writer, and reads given `bind_arguments={"replica": False}`.
+        Other reads go to a healthy replica, chosen once per session so that
+        its reads see one consistent state, and fall back to the writer when
+        there is none.
         """
-        if self._flushing or isinstance(clause, (Update, Delete, Insert)):
+        scope = session_context.get(None)
+        if writer or self._flushing or isinstance(clause, (Update, Delete, Insert)):
+            self.info["wrote"] = True
+            if isinstance(scope, RequestScope):
+                scope.wrote = True
+            return engines["writer"].sync_engine
+        if (
+            not replica
+            or self.info.get("wrote")
+            or (isinstance(scope, RequestScope) and scope.prefer_writer)
+        ):
             return engines["writer"].sync_engine
-        return engines["reader"].sync_engine
+        if "replica" not in self.info:
+            self.info["replica"] = replicas.choose()
+        return (self.info["replica"] or engines["writer"]).sync_engine
 
 
 async_session_factory = sessionmaker(
@@ -92,6 +171,7 @@ async def test_connection():
         logger.error(f"Failed to connect to database: {e}", exc_info=True)
         return False
     finally:
+        await session.remove()
         reset_session_context(token)
 
 
@@ -0,0 +1,145 @@
+import random
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import config
+from core.metrics import db_statement_duration
+from core.utils.json import dumps
+from core.utils.logging import logger
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_LOGGED_STATEMENT = 2000
+EXPLAIN_PREFIX = "EXPLAIN (FORMAT JSON)"
+EXPLAIN_SAVEPOINT = "explain_slow_statement"
+
+
+def _operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if isinstance(value, datetime):
+        return "datetime"
+    if isinstance(value, date):
+        return "date"
+    return type(value).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """
+    Describe the parameters of a statement by their types only, so that a
+    log of slow statements does not leak the data they carry.
+
+    Args:
+        parameters (Any): The DBAPI parameters, a sequence or a mapping
+        executemany (bool): Whether `parameters` is a list of parameter sets
+
+    Returns:
+        str: The shape, e.g. "(int, str)" or "1000 x (int, str)"
+    """
+    if executemany:
+        if not parameters:
+            return "0 x ()"
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        fields = ", ".join(
+            f"{key}: {_type_name(value)}" for key, value in parameters.items()
+        )
+        return f"{{{fields}}}"
+    if isinstance(parameters, (list, tuple)):
+        return f"({', '.join(_type_name(value) for value in parameters)})"
+    return "()"
+
+
+def explain(connection, statement: str, parameters: Any) -> Optional[str]:
+    """
+    Return the plan the planner picks for `statement`, without running it,
+    or None if it cannot be explained.
+
+    The EXPLAIN runs on the caller's connection inside a savepoint, so that
+    its failure is rolled back without aborting the caller's transaction.
+    """
+    if _operation(statement) not in EXPLAINABLE:
+        return None
+    cursor = connection.connection.cursor()
+    try:
+        try:
+            cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        except Exception as e:
+            logger.debug(f"Could not explain slow statement: {e}")
+            return None
+        try:
+            cursor.execute(f"{EXPLAIN_PREFIX} {statement}", parameters)
+            plan = cursor.fetchone()[0]
+        except Exception as e:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            logger.debug(f"Could not explain slow statement: {e}")
+            return None
+        finally:
+            cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        return plan if isinstance(plan, str) else dumps(plan)
+    finally:
+        cursor.close()
+
+
+def instrument_engine(
+    engine: AsyncEngine,
+    name: str,
+    on_statement: Optional[Callable[[float], None]] = None,
+) -> None:
+    """
+    Time every statement run on `engine`: record it in the
+    `db_statement_duration_seconds` histogram labelled with `name`, pass it
+    to `on_statement`, and log statements slower than
+    `config.SLOW_QUERY_THRESHOLD` with the shape of their parameters and,
+    for a sample of them, their plan.
+
+    Args:
+        engine (AsyncEngine): The engine
+        name (str): Name of the engine in the metrics
+        on_statement (Optional[Callable[[float], None]]): Called with the
+            duration of each statement, in seconds
+    """
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        conn.info.setdefault("statement_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["statement_start"].pop()
+        db_statement_duration.observe(elapsed, name, _operation(statement))
+        if on_statement is not None:
+            on_statement(elapsed)
+        if elapsed < config.SLOW_QUERY_THRESHOLD:
+            return
+
+        message = (
+            f"Slow statement on {name} ({elapsed * 1000:.1f} ms, parameters "
+            f"{parameter_shape(parameters, executemany)}): "
+            f"{statement[:MAX_LOGGED_STATEMENT]}"
+        )
+        if (
+            not executemany
+            and config.SLOW_QUERY_EXPLAIN_RATE
+            and random.random() < config.SLOW_QUERY_EXPLAIN_RATE
+        ):
+            plan = explain(conn, statement, parameters)
+            if plan is not None:
+                message = f"{message}\nPlan: {plan}"
+        logger.warning(message)
+
+    def handle_error(context) -> None:
+        if context.connection is not None:
+            starts = context.connection.info.get("statement_start")
+            if starts:
+                starts.pop()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
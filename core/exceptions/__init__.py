@@ -4,6 +4,7 @@ from .base import (
     ForbiddenException,
     InternalServerError,
     NotFoundException,
+    PreconditionFailedException,
     UnauthorizedException,
     UnprocessableEntity,
 )
@@ -14,6 +15,7 @@ __all__ = [
     "NotFoundException",
     "ForbiddenException",
     "UnauthorizedException",
+    "PreconditionFailedException",
     "UnprocessableEntity",
     "InternalServerError",
 ]
@@ -42,6 +42,11 @@ class UnprocessableEntity(CustomException):
     status_code = HTTPStatus.UNPROCESSABLE_ENTITY
     detail = HTTPStatus.UNPROCESSABLE_ENTITY.description
 
+class PreconditionFailedException(CustomException):
+    code = HTTPStatus.PRECONDITION_FAILED
+    status_code = HTTPStatus.PRECONDITION_FAILED
+    detail = HTTPStatus.PRECONDITION_FAILED.description
+
 class DatabaseError(CustomException):
     pass
 
@@ -0,0 +1,269 @@
+import zlib
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import config
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoder
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional encoder
+    zstandard = None
+
+# Request headers holding entity tags the application compares with its own.
+CONDITIONAL_HEADERS = (b"if-match", b"if-none-match")
+
+# Content types that are already compressed and would only cost CPU.
+UNCOMPRESSIBLE_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "application/gzip",
+    "application/zip",
+    "application/zstd",
+    "application/x-gzip",
+)
+
+
+class Compressor:
+    """
+    Incremental encoder of a response body. `compress` returns whatever can
+    be sent so far, flushed so streamed chunks reach the client right away;
+    `finish` returns the rest.
+    """
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._encoder = zstandard.ZstdCompressor(level=min(level, 19)).compressobj()
+        elif encoding == "br":
+            self._encoder = brotli.Compressor(quality=min(level, 11))
+        else:
+            self._encoder = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "zstd":
+            return self._encoder.compress(data) + self._encoder.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        if self.encoding == "br":
+            return self._encoder.process(data) + self._encoder.flush()
+        return self._encoder.compress(data) + self._encoder.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "zstd":
+            return self._encoder.flush()
+        if self.encoding == "br":
+            return self._encoder.finish()
+        return self._encoder.flush(zlib.Z_FINISH)
+
+    def compress_all(self, data: bytes) -> bytes:
+        if self.encoding == "zstd":
+            return self._encoder.compress(data) + self._encoder.flush()
+        if self.encoding == "br":
+            return self._encoder.process(data) + self._encoder.finish()
+        return self._encoder.compress(data) + self._encoder.flush(zlib.Z_FINISH)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """
+    Encodings the server can produce, most preferred first.
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+def negotiate(accept_encoding: str, supported: tuple[str, ...]) -> Optional[str]:
+    """
+    Pick the encoding of a response from an `Accept-Encoding` header.
+
+    The encoding with the highest quality value wins; ties go to the first
+    in `supported`. Encodings with q=0 are refused.
+
+    Args:
+        accept_encoding (str): Value of the request header
+        supported (tuple[str, ...]): Encodings the server can produce, most
+            preferred first
+
+    Returns:
+        Optional[str]: The chosen encoding, or None to send the body as is
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        key, _, value = params.strip().partition("=")
+        if key.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Tag a strong entity tag with the content coding of the body it now
+    covers, e.g. `"abc"` becomes `"abc-gzip"`. Weak tags are left as is.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_encoded_etags(value: str, encodings: tuple[str, ...]) -> tuple[str, bool]:
+    """
+    Remove the content coding suffixes added by `encoded_etag` from the tags
+    of a conditional request header, so the application compares the tags it
+    issued.
+
+    Returns:
+        tuple[str, bool]: The header value and whether a suffix was removed
+    """
+    stripped = value
+    for encoding in encodings:
+        stripped = stripped.replace(f'-{encoding}"', '"')
+    return stripped, stripped != value
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with the best encoding the
+    client accepts: zstd or brotli when their packages are installed, and
+    gzip otherwise.
+
+    Complete bodies smaller than `minimum_size` and responses that are
+    already encoded or of an already compressed type are sent unchanged.
+    Streamed bodies are compressed chunk by chunk as they are produced.
+
+    A strong `ETag` of a compressed body gets the encoding appended, since
+    the bytes differ from the identity body. The suffix is removed again from
+    `If-Match` and `If-None-Match` before the application sees them, and put
+    back on the `ETag` of a 304 answering a suffixed tag.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = config.COMPRESSION_MINIMUM_SIZE,
+        level: int = config.COMPRESSION_LEVEL,
+        encodings: Optional[tuple[str, ...]] = None,
+    ) -> None:
+        """
+        Args:
+            app (ASGIApp): The wrapped application
+            minimum_size (int): Smallest complete body worth compressing, in bytes
+            level (int): Compression level, capped to what each encoder supports
+            encodings (Optional[tuple[str, ...]]): Encodings to offer, most
+                preferred first. Defaults to every available encoding
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.encodings = encodings or available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        scope, suffixed = self._strip_conditional_etags(scope)
+        encoding = negotiate(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, self._wrap_send(send, encoding, suffixed))
+
+    def _strip_conditional_etags(self, scope: Scope) -> tuple[Scope, bool]:
+        headers, suffixed = [], False
+        for name, value in scope["headers"]:
+            if name in CONDITIONAL_HEADERS:
+                text, stripped = strip_encoded_etags(
+                    value.decode("latin-1"), self.encodings
+                )
+                if stripped:
+                    value, suffixed = text.encode("latin-1"), True
+            headers.append((name, value))
+        if not suffixed:
+            return scope, False
+        return {**scope, "headers": headers}, True
+
+    def _wrap_send(self, send: Send, encoding: str, suffixed: bool) -> Callable:
+        start: Optional[Message] = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                if message["status"] == 304 and suffixed:
+                    headers = MutableHeaders(scope=message)
+                    if "etag" in headers:
+                        headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = "content-encoding" in headers or content_type.startswith(
+                    UNCOMPRESSIBLE_TYPES
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    passthrough = True
+                    return
+                compressor = Compressor(encoding, self.level)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                if more_body:
+                    del headers["Content-Length"]
+                    body = compressor.compress(body)
+                else:
+                    body = compressor.compress_all(body)
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+            elif more_body:
+                body = compressor.compress(body)
+            else:
+                body = compressor.compress(body) + compressor.finish()
+            await send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+
+        return wrapped_send
@@ -1,12 +1,46 @@
-from uuid import uuid4
-from starlette.types import ASGIApp, Receive, Scope, Send
-from core.database.session import reset_session_context, session, set_session_context
+import time
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import config
+from core.database.session import (
+    RequestScope,
+    replicas,
+    reset_session_context,
+    session,
+    set_session_context,
+)
+
+
+def _prefers_writer(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            cookie = SimpleCookie(value.decode("latin-1"))
+            if config.READ_YOUR_WRITES_COOKIE in cookie:
+                return True
+    return False
 
 
 class SQLAlchemyMiddleware:
     """
-    ASGI middleware for managing SQLAlchemy database sessions.It creates a unique session
-    context for each request and cleans up resources after the request is completed.
+    ASGI middleware for managing SQLAlchemy database sessions. It scopes a session
+    to each request and cleans up resources after the request is completed.
+
+    The session itself is only created when the request first uses it, so
+    requests that never touch the database, such as the docs or CORS
+    preflights, pay for nothing but a context variable.
+
+    When reads go to replicas, a request that writes gets a short-lived
+    cookie sending the reads of the client's next requests to the writer,
+    so that it reads its own writes while the replicas catch up.
+
+    With `SERVER_TIMING_ENABLED`, responses carry a `Server-Timing` header
+    with the number of statements the request ran and their total duration,
+    as of when the response starts, next to the time spent handling the
+    request. It is off by default, leaving `send` unwrapped when no replicas
+    are configured.
     """
 
     def __init__(self, app: ASGIApp) -> None:
@@ -15,9 +49,9 @@ class SQLAlchemyMiddleware:
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process an incoming request with database session management.
-        Creates a new session context for each request, executes the request,
-        and ensures proper cleanup of database resources regardless of request
-        success or failure.
+        Scopes the session to the request with a fresh `RequestScope`, executes
+        the request, and closes the session, if one was created, regardless of
+        request success or failure.
 
         Args:
             scope (Scope): The ASGI connection scope
@@ -27,13 +61,46 @@ class SQLAlchemyMiddleware:
         Raises:
             Exception: Re-raises any exceptions that occur during request processing
         """
-        session_id = str(uuid4())
-        context = set_session_context(session_id=session_id)
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request_scope = RequestScope()
+        sticky = bool(replicas.replicas)
+        if sticky:
+            request_scope.prefer_writer = _prefers_writer(scope)
+        if sticky or config.SERVER_TIMING_ENABLED:
+            send = self._wrap_send(request_scope, send, sticky)
 
+        context = set_session_context(session_id=request_scope)
         try:
             await self.app(scope, receive, send)
-        except Exception as exception:
-            raise exception
         finally:
-            await session.remove()
+            if session.registry.has():
+                await session.remove()
             reset_session_context(context=context)
+
+    @staticmethod
+    def _wrap_send(request_scope: RequestScope, send: Send, sticky: bool) -> Send:
+        start = time.perf_counter()
+
+        async def wrapped_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if sticky and request_scope.wrote:
+                    headers.append(
+                        "Set-Cookie",
+                        f"{config.READ_YOUR_WRITES_COOKIE}=1; "
+                        f"Max-Age={config.READ_YOUR_WRITES_WINDOW}; Path=/; HttpOnly",
+                    )
+                if config.SERVER_TIMING_ENABLED:
+                    elapsed = time.perf_counter() - start
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={request_scope.db_time * 1000:.1f};'
+                        f'desc="{request_scope.queries} queries", '
+                        f"app;dur={elapsed * 1000:.1f}",
+                    )
+            await send(message)
+
+        return wrapped_send
@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+from core.utils.json import dumps_bytes
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with `orjson` when it is installed, and with the
+    stdlib `json` module otherwise.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    Return the cached adapter validating and serializing lists of `model`.
+    """
+    return TypeAdapter(List[model])
+
+
+def model_list_response(
+    model: Type[BaseModel], items: Iterable[Any], **kwargs: Any
+) -> Response:
+    """
+    Build a JSON response from objects read through the attributes of
+    `model`, such as ORM instances. The list is validated and encoded to
+    bytes in one pass by pydantic-core, instead of being converted to
+    Python dicts and encoded again.
+
+    Args:
+        model (Type[BaseModel]): The response schema of an item
+        items (Iterable[Any]): The items to serialize
+        **kwargs (Any): Further arguments of the response, such as `headers`
+
+    Returns:
+        Response: The JSON response
+    """
+    adapter = list_adapter(model)
+    content = adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+    return Response(content=content, media_type="application/json", **kwargs)
+
+
+def model_response(model: Type[BaseModel], item: Any, **kwargs: Any) -> Response:
+    """
+    Build a JSON response from an object read through the attributes of
+    `model`, such as a dict holding ORM instances, the way
+    `model_list_response` does for lists.
+
+    Args:
+        model (Type[BaseModel]): The response schema
+        item (Any): The object to serialize
+        **kwargs (Any): Further arguments of the response, such as `status_code`
+
+    Returns:
+        Response: The JSON response
+    """
+    content = model.model_validate(item, from_attributes=True).model_dump_json()
+    return Response(content=content, media_type="application/json", **kwargs)
@@ -0,0 +1,21 @@
+from .database import register_pool_metrics
+from .instruments import (
+    db_statement_duration,
+    exceptions,
+    http_request_duration,
+    http_requests,
+)
+from .registry import Counter, Gauge, Histogram, Registry, registry
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "registry",
+    "register_pool_metrics",
+    "db_statement_duration",
+    "exceptions",
+    "http_request_duration",
+    "http_requests",
+]
@@ -0,0 +1,57 @@
+from typing import Callable, Dict
+
+from .registry import registry
+
+POOL_STATES = ("checked_out", "idle", "overflow")
+
+
+def register_pool_metrics(get_stats: Callable[[], Dict[str, dict]]) -> None:
+    """
+    Expose the pool statistics returned by `get_stats`, keyed by engine
+    name, as gauges and counters read when the metrics are collected.
+    """
+
+    def connections():
+        return [
+            ((engine, state), stats[state])
+            for engine, stats in get_stats().items()
+            for state in POOL_STATES
+        ]
+
+    def field(name: str):
+        return lambda: [
+            ((engine,), stats[name])
+            for engine, stats in get_stats().items()
+            if name in stats
+        ]
+
+    registry.gauge(
+        "db_pool_connections",
+        "Connections of the pool, by engine and state",
+        ("engine", "state"),
+        callback=connections,
+    )
+    registry.gauge(
+        "db_pool_size",
+        "Connections kept in the pool",
+        ("engine",),
+        callback=field("size"),
+    )
+    registry.counter(
+        "db_pool_checkouts_total",
+        "Connections checked out of the pool",
+        ("engine",),
+        callback=field("checkouts"),
+    )
+    registry.counter(
+        "db_pool_checkout_timeouts_total",
+        "Checkouts that gave up waiting for a connection",
+        ("engine",),
+        callback=field("timeouts"),
+    )
+    registry.counter(
+        "db_pool_checkout_wait_seconds_total",
+        "Time spent acquiring connections from the pool",
+        ("engine",),
+        callback=field("wait_time_total"),
+    )
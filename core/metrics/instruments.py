@@ -0,0 +1,27 @@
+from .registry import registry
+
+DB_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0
+)
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status code",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request, by route template",
+    ("method", "route"),
+)
+db_statement_duration = registry.histogram(
+    "db_statement_duration_seconds",
+    "Time to execute a database statement, by engine and statement type",
+    ("engine", "operation"),
+    buckets=DB_BUCKETS,
+)
+exceptions = registry.counter(
+    "app_exceptions_total",
+    "Application exceptions returned to clients, by exception class",
+    ("exception",),
+)
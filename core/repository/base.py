@@ -1,32 +1,170 @@
-from typing import Generic, List, Optional, Type, TypeVar, Union
+import json
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from asyncpg.exceptions import (
     NotNullViolationError,
+    PostgresError,
     UndefinedTableError,
     UniqueViolationError,
 )
-from sqlalchemy import delete, select, update
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    any_,
+    bindparam,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.exc import (
+    DBAPIError,
     IntegrityError,
     NoResultFound,
     ProgrammingError,
     SQLAlchemyError,
 )
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.sql import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import TTLCache, mark_changed
+from core.config import config
 from core.database.session import Base
-from core.exceptions.base import DatabaseError, UnprocessableEntity
+from core.exceptions.base import (
+    DatabaseError,
+    PreconditionFailedException,
+    UnprocessableEntity,
+)
 from core.repository.enum import SynchronizeSessionEnum
+from core.repository.explain import Explain
 from core.utils.logging import logger
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+FILTER_OPERATORS = {
+    "eq": lambda field, value: field == value,
+    "prefix": lambda field, value: field.startswith(value, autoescape=True),
+    "lt": lambda field, value: field < value,
+    "lte": lambda field, value: field <= value,
+    "gt": lambda field, value: field > value,
+    "gte": lambda field, value: field >= value,
+}
+
+
+count_cache = TTLCache(maxsize=config.COUNT_CACHE_SIZE, ttl=config.COUNT_CACHE_TTL)
+
+# Pre-built statements keyed by (model, shape). Values are bound parameters,
+# so a statement is built, and its compilation cache key computed, only once.
+statement_cache: dict[Tuple[Any, ...], Any] = {}
+
 
 class BaseRepo(Generic[ModelType]):
+    sortable_fields: Tuple[str, ...] = ("id",)
+
     def __init__(self, model: Type[ModelType], db_session: AsyncSession):
         self.session = db_session
         self.model = model
 
+    @property
+    def columns(self) -> list:
+        """
+        Columns of the model table that are read by plain row queries.
+        Computed columns, such as search vectors, are left out.
+        """
+        return [
+            column for column in self.model.__table__.columns if column.computed is None
+        ]
+
+    def _changed(self, ids: List[Any]) -> None:
+        """
+        Record IDs written in the current transaction, for cache invalidation.
+        """
+        mark_changed(self.session, self.model.__tablename__, ids)
+
+    def _statement(self, key: Tuple[Any, ...], build: Callable[[], Any]) -> Any:
+        """
+        Return the cached statement of this model for `key`, building it
+        with `build` on first use.
+        """
+        cache_key = (self.model, *key)
+        statement = statement_cache.get(cache_key)
+        if statement is None:
+            statement = statement_cache[cache_key] = build()
+        return statement
+
+    def _filter_conditions(self, filters: Optional[dict]) -> list:
+        """
+        Translate a filter mapping into SQL conditions.
+
+        Keys are either a field name, matched for equality, or
+        `<field>__<operator>` where the operator is one of FILTER_OPERATORS.
+        Filters with a None value are ignored.
+
+        Args:
+            filters (Optional[dict]): Mapping of filter keys to values
+
+        Raises:
+            ValueError: If a field or operator does not exist
+        """
+        conditions = []
+        for key, value in (filters or {}).items():
+            if value is None:
+                continue
+            field, _, operator = key.partition("__")
+            model_field = getattr(self.model, field, None)
+            if model_field is None:
+                raise ValueError(f"Field '{field}' does not exist in the model.")
+            if (operator or "eq") not in FILTER_OPERATORS:
+                raise ValueError(f"Filter operator '{operator}' is not supported.")
+            conditions.append(FILTER_OPERATORS[operator or "eq"](model_field, value))
+        return conditions
+
+    def _selection(
+        self,
+        ids: Optional[List[int]],
+        filters: Optional[dict],
+        after: Optional[int],
+        limit: Optional[int],
+    ) -> list:
+        """
+        Build the WHERE clause of a set-based write. An ID list is matched
+        with `id = ANY(:ids)`; a filter selects the next `limit` matching IDs
+        greater than `after`, so large sets can be processed in chunks.
+        """
+        if ids is not None:
+            return [
+                self.model.id
+                == any_(bindparam("ids", list(ids), type_=ARRAY(BigInteger)))
+            ]
+        query = select(self.model.id).where(*self._filter_conditions(filters))
+        if after is not None:
+            query = query.where(self.model.id > after)
+        query = query.order_by(self.model.id).limit(limit)
+        return [self.model.id.in_(query.scalar_subquery())]
+
     async def create(self, params: dict) -> ModelType:
         """
         Create a new instance of the model in the database.
@@ -50,6 +188,7 @@ class BaseRepo(Generic[ModelType]):
             self.session.add(instance)
 
             await self.session.flush()
+            self._changed([instance.id])
             return instance
         except IntegrityError as e:
             logger.error(f"IntegrityError occurred: {e}", exc_info=True)
@@ -73,21 +212,406 @@ class BaseRepo(Generic[ModelType]):
             logger.error(f"Database error occurred: {e}", exc_info=True)
             raise DatabaseError("Database error occurred.") from e
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+    def _upsert_values(self, query, params: dict) -> dict:
+        """
+        SET clause replacing an existing row with the inserted values. Column
+        `onupdate` defaults are applied too, as ON CONFLICT does not.
+        """
+        values = {name: query.excluded[name] for name in params if name != "id"}
+        for column in self.columns:
+            if column.onupdate is not None and column.name not in values:
+                values[column.name] = column.onupdate.arg
+        return values
+
+    async def upsert(
+        self, params: dict, on_conflict: str = "update"
+    ) -> Tuple[ModelType, bool]:
+        """
+        Insert an instance of the model, resolving an ID conflict with a
+        single INSERT ... ON CONFLICT ... RETURNING statement instead of an
+        integrity error.
+
+        Args:
+            params (Dict[str, Any]): Model attributes, including the ID
+            on_conflict (str, optional): "update" overwrites the existing row
+                with `params`, "ignore" keeps it. Defaults to "update"
+
+        Returns:
+            Tuple[ModelType, bool]: The stored instance and whether it was created
+
+        Raises:
+            ValueError: If `on_conflict` is not supported
+            UnprocessableEntity: For null violations
+            DatabaseError: For database-related errors
+        """
+        if on_conflict not in ("update", "ignore"):
+            raise ValueError(f"Unsupported conflict resolution: {on_conflict}")
+        id_column = self.model.__table__.c.id
+        query = insert(self.model.__table__).values(**params)
+        try:
+            if on_conflict == "update":
+                query = query.on_conflict_do_update(
+                    index_elements=[id_column],
+                    set_=self._upsert_values(query, params),
+                ).returning(*self.columns, literal_column("xmax = 0").label("created"))
+            else:
+                inserted = (
+                    query.on_conflict_do_nothing(index_elements=[id_column])
+                    .returning(*self.columns)
+                    .cte("inserted")
+                )
+                query = select(*inserted.c, literal(True).label("created")).union_all(
+                    select(*self.columns, literal(False)).where(
+                        id_column == params["id"], ~exists(select(inserted.c.id))
+                    )
+                )
+            result = await self.session.execute(
+                select(self.model, column("created", Boolean))
+                .from_statement(query)
+                .execution_options(populate_existing=True),
+                bind_arguments={"writer": True},
+            )
+            row = result.first()
+            self._changed([params["id"]])
+            if row is None:
+                # The conflicting row was committed after this statement's snapshot
+                return await self.get_by_field("id", params["id"]), False
+            return row[0], row[1]
+        except IntegrityError as e:
+            if getattr(e.orig, "sqlstate", None) == NotNullViolationError.sqlstate:
+                raise UnprocessableEntity("Required field cannot be null") from e
+            raise DatabaseError("Integrity error while upserting record.") from e
+        except SQLAlchemyError as e:
+            logger.error(f"Database error occurred: {e}", exc_info=True)
+            raise DatabaseError("Database error occurred.") from e
+
+    async def bulk_create(
+        self, params_list: List[dict], copy: Optional[bool] = None
+    ) -> Tuple[List[ModelType], List[int]]:
+        """
+        Create many instances of the model in a single round trip.
+
+        Small batches are written with a multi-row `INSERT ... ON CONFLICT DO
+        NOTHING RETURNING`. Batches of at least `BULK_COPY_THRESHOLD` rows are
+        streamed with COPY into a staging table and moved over with one
+        `INSERT ... SELECT`. Rows whose ID already exists, in the table or
+        earlier in the batch, are skipped instead of aborting the batch.
+
+        Args:
+            params_list (List[dict]): Model attributes for each instance, all
+                with the same keys
+            copy (Optional[bool]): Force (True) or prevent (False) the COPY
+                path instead of choosing it from the batch size
+
+        Returns:
+            Tuple[List[ModelType], List[int]]: Created model instances and the
+                positions in `params_list` of the rows that conflicted
+
+        Raises:
+            DatabaseError: For database-related errors
+        """
+        if not params_list:
+            return [], []
+
+        seen = set()
+        rows = []
+        for params in params_list:
+            if params["id"] not in seen:
+                seen.add(params["id"])
+                rows.append(params)
+
+        try:
+            if copy is None:
+                copy = len(rows) >= config.BULK_COPY_THRESHOLD
+            if copy:
+                created = await self._copy_create(rows)
+            else:
+                query = (
+                    insert(self.model)
+                    .on_conflict_do_nothing(index_elements=[self.model.id])
+                    .returning(self.model)
+                )
+                result = await self.session.execute(query, rows)
+                created = list(result.scalars().all())
+        except IntegrityError as e:
+            logger.error(f"IntegrityError occurred: {e}", exc_info=True)
+            raise DatabaseError("Integrity error while Creating records.") from e
+        except ProgrammingError as e:
+            error_code = getattr(e.orig, "sqlstate", None)
+            if error_code == UndefinedTableError.sqlstate:
+                raise DatabaseError("Database table does not exist.") from e
+
+            raise DatabaseError("Database programming error occurred.") from e
+        except SQLAlchemyError as e:
+            logger.error(f"Database error occurred: {e}", exc_info=True)
+            raise DatabaseError("Database error occurred.") from e
+
+        created_ids = {instance.id for instance in created}
+        self._changed(created_ids)
+        conflicts = []
+        for index, params in enumerate(params_list):
+            if params["id"] in created_ids:
+                created_ids.discard(params["id"])
+            else:
+                conflicts.append(index)
+        return created, conflicts
+
+    async def _copy_create(self, rows: List[dict]) -> List[ModelType]:
+        """
+        COPY the rows into a temporary staging table, then insert them into the
+        model table skipping ID conflicts. Everything runs on the writer
+        connection of the current transaction.
+
+        COPY writes None as NULL, so None values of columns with a scalar
+        default are replaced by the default first, as the INSERT path does.
         """
-        Retrieve all instances of the model with pagination support
+        names = list(rows[0].keys())
+        columns = self.model.__table__.c
+        defaults = {
+            name: columns[name].default.arg
+            for name in names
+            if name in columns
+            and columns[name].default is not None
+            and columns[name].default.is_scalar
+        }
+        staging_name = f"{self.model.__tablename__}_bulk_staging"
+        staging = table(staging_name, *[column(name) for name in names])
+        query = (
+            insert(self.model)
+            .from_select(names, select(*staging.c))
+            .on_conflict_do_nothing(index_elements=[self.model.id])
+            .returning(self.model)
+        )
+
+        connection = await self.session.connection(bind_arguments={"clause": query})
+        await connection.execute(
+            text(
+                f'CREATE TEMP TABLE "{staging_name}" ON COMMIT DROP AS '
+                f"SELECT {', '.join(names)} FROM {self.model.__tablename__} "
+                "WITH NO DATA"
+            )
+        )
+        raw_connection = await connection.get_raw_connection()
+        try:
+            await raw_connection.driver_connection.copy_records_to_table(
+                staging_name,
+                records=[
+                    tuple(
+                        defaults[name] if row[name] is None and name in defaults
+                        else row[name]
+                        for name in names
+                    )
+                    for row in rows
+                ],
+                columns=names,
+            )
+        except PostgresError as e:
+            # COPY bypasses SQLAlchemy, so wrap the driver error like it would
+            raise DBAPIError(f'COPY "{staging_name}"', None, e) from e
+        result = await self.session.execute(query)
+        created = list(result.scalars().all())
+        await connection.execute(text(f'DROP TABLE "{staging_name}"'))
+        return created
+
+    def _page_query(
+        self,
+        query: Select,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[Any, int]] = None,
+        sort: str = "id",
+        filters: Optional[dict] = None,
+    ) -> Select:
+        """
+        Apply filters, ordering and pagination to a listing query.
+
+        The sort is a whitelisted field name, prefixed with "-" for descending
+        order, and the ID is always used as tie-breaker. When `after` is given
+        the page is located with a keyset predicate `(sort, id) > (value, id)`
+        (`<` when descending) instead of an OFFSET.
+
+        Raises:
+            ValueError: If the sort field is not in `sortable_fields`
+        """
+        descending = sort.startswith("-")
+        sort_name = sort.lstrip("-")
+        if sort_name not in self.sortable_fields:
+            raise ValueError(f"Sorting by '{sort_name}' is not supported.")
+        sort_field = getattr(self.model, sort_name)
+
+        query = query.where(*self._filter_conditions(filters))
+        if after is not None:
+            value, last_id = after
+            if sort_name == "id":
+                position, last = self.model.id, last_id
+            else:
+                position = tuple_(sort_field, self.model.id)
+                last = tuple_(value, last_id)
+            query = query.where(position < last if descending else position > last)
+        else:
+            query = query.offset(skip)
+
+        order_by = [sort_field] if sort_name == "id" else [sort_field, self.model.id]
+        if descending:
+            order_by = [field.desc() for field in order_by]
+        return query.order_by(*order_by).limit(limit)
+
+    def _cursor_value(self, sort: str, value: Any) -> Any:
+        """
+        Check that a keyset position value fits the type of the sort field,
+        parsing ISO timestamps for datetime fields.
+
+        Raises:
+            ValueError: If the value does not fit the sort field
+        """
+        sort_field = getattr(self.model, sort.lstrip("-"), self.model.id)
+        python_type = sort_field.type.python_type
+        if python_type is datetime and isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError as e:
+                raise ValueError("Invalid pagination cursor") from e
+        if not isinstance(value, python_type) or (
+            isinstance(value, bool) and python_type is not bool
+        ):
+            raise ValueError("Invalid pagination cursor")
+        return value
+
+    def _after_params(self, sort: str) -> Tuple[Any, Any]:
+        """Bound parameters standing for the keyset position of a page."""
+        sort_field = getattr(self.model, sort.lstrip("-"), self.model.id)
+        return (
+            bindparam("after_value", type_=sort_field.type),
+            bindparam("after_id", type_=self.model.id.type),
+        )
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[Any, int]] = None,
+        sort: str = "id",
+        filters: Optional[dict] = None,
+        as_rows: bool = False,
+    ) -> Union[List[ModelType], List[RowMapping]]:
+        """
+        Retrieve all instances of the model with filtering, sorting and
+        pagination support.
+
+        Pages are addressed either by offset (`skip`) or, so that the cost of
+        a page does not depend on how deep it is, by the keyset position of
+        the last row of the previous page (`after`).
+
         Args:
-            skip (int): Skip the instances
+            skip (int): Skip the instances (ignored when `after` is given)
             limit (int): Number of instances to fetch in one go
+            after (Optional[Tuple[Any, int]]): Sort value and ID of the last
+                row of the previous page
+            sort (str): Field to order the instances by, "-" prefixed for
+                descending order
+            filters (Optional[dict]): Filter selecting the instances
+            as_rows (bool): Return read-only row mappings of the table columns
+                instead of ORM instances, skipping hydration and the identity map
 
         Raises:
-            NoResultFound: If record with ID doesn't exist
+            ValueError: If the sort or a filter field is not supported, or
+                `after` does not fit the sort field
             DatabaseError: If database update fails
         """
         try:
-            query = select(self.model).offset(skip).limit(limit)
-            result = await self.session.execute(query)
-            return result.scalars().all()
+            entities = self.columns if as_rows else [self.model]
+            if after is not None:
+                after = (self._cursor_value(sort, after[0]), after[1])
+            if any(value is not None for value in (filters or {}).values()):
+                query = self._page_query(
+                    select(*entities), skip, limit, after, sort, filters
+                )
+                result = await self.session.execute(query)
+                return result.mappings().all() if as_rows else result.scalars().all()
+
+            params = {"skip": skip, "limit": limit}
+            if after is not None:
+                params["after_value"], params["after_id"] = after
+            query = self._statement(
+                ("get_all", sort, after is not None, as_rows),
+                lambda: self._page_query(
+                    select(*entities),
+                    skip=bindparam("skip"),
+                    limit=bindparam("limit"),
+                    after=self._after_params(sort) if after is not None else None,
+                    sort=sort,
+                ),
+            )
+            result = await self.session.execute(query, params)
+            return result.mappings().all() if as_rows else result.scalars().all()
+        except ProgrammingError as e:
+            logger.error(f"Database table does not exist: {e}", exc_info=True)
+            error_code = getattr(e.orig, "sqlstate", None)
+            if error_code == UndefinedTableError.sqlstate:
+                raise DatabaseError("Database table does not exist.") from e
+
+            raise DatabaseError("Database programming error occurred.") from e
+        except SQLAlchemyError as e:
+            logger.error(f"Database error occurred: {e}", exc_info=True)
+            raise DatabaseError("Database error occurred.") from e
+
+    async def count(self, filters: Optional[dict] = None, mode: str = "exact") -> int:
+        """
+        Count the instances of the model matching a filter.
+
+        Three modes trade accuracy for cost:
+        * `exact` runs `SELECT count(*)`, which visits every matching row
+        * `estimate` reads the planner statistics: `pg_class.reltuples` for
+          the whole table, the row estimate of the query plan otherwise
+        * `cached` returns an exact count computed at most `COUNT_CACHE_TTL`
+          seconds ago for the same filter
+
+        Args:
+            filters (Optional[dict]): Filter selecting the instances to count
+            mode (str): One of "exact", "estimate" or "cached"
+
+        Raises:
+            ValueError: If the mode or a filter field is not supported
+            DatabaseError: If database query fails
+        """
+        conditions = self._filter_conditions(filters)
+        try:
+            if mode == "cached":
+                active = {k: v for k, v in (filters or {}).items() if v is not None}
+                key = (self.model.__tablename__, tuple(sorted(active.items())))
+                total = count_cache.get(key)
+                if total is None:
+                    total = await self.count(filters, mode="exact")
+                    count_cache.set(key, total)
+                return total
+
+            if mode == "estimate":
+                if not conditions:
+                    result = await self.session.execute(
+                        text(
+                            "SELECT reltuples::bigint FROM pg_class "
+                            "WHERE oid = to_regclass(:table_name)"
+                        ),
+                        {"table_name": self.model.__tablename__},
+                    )
+                    estimate = result.scalar()
+                    # reltuples is -1 until the table is first vacuumed or analyzed
+                    if estimate is not None and estimate >= 0:
+                        return estimate
+                result = await self.session.execute(
+                    Explain(select(self.model.id).where(*conditions))
+                )
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+
+            if mode != "exact":
+                raise ValueError(f"Count mode '{mode}' is not supported.")
+            result = await self.session.execute(
+                select(func.count()).select_from(self.model).where(*conditions)
+            )
+            return result.scalar_one()
         except ProgrammingError as e:
             logger.error(f"Database table does not exist: {e}", exc_info=True)
             error_code = getattr(e.orig, "sqlstate", None)
@@ -99,30 +623,93 @@ class BaseRepo(Generic[ModelType]):
             logger.error(f"Database error occurred: {e}", exc_info=True)
             raise DatabaseError("Database error occurred.") from e
 
+    async def stream_all(
+        self, filters: Optional[dict] = None, fetch_size: int = 1000
+    ) -> AsyncIterator[List[RowMapping]]:
+        """
+        Stream all rows of the model table through a server-side cursor.
+
+        Rows are fetched `fetch_size` at a time as plain column mappings, so
+        nothing accumulates in the session identity map and memory use does
+        not grow with the table. The rows come from a single statement and
+        therefore from a single consistent snapshot.
+
+        Args:
+            filters (Optional[dict]): Filter selecting the rows to stream
+            fetch_size (int): Number of rows fetched per round trip
+
+        Yields:
+            List[RowMapping]: The next batch of at most `fetch_size` rows
+
+        Raises:
+            DatabaseError: If database query fails
+        """
+        query = (
+            select(*self.columns)
+            .where(*self._filter_conditions(filters))
+            .order_by(self.model.id)
+            .execution_options(yield_per=fetch_size)
+        )
+        try:
+            result = await self.session.stream(query)
+            async for partition in result.mappings().partitions(fetch_size):
+                yield partition
+        except ProgrammingError as e:
+            logger.error(f"Database table does not exist: {e}", exc_info=True)
+            error_code = getattr(e.orig, "sqlstate", None)
+            if error_code == UndefinedTableError.sqlstate:
+                raise DatabaseError("Database table does not exist.") from e
+
+            raise DatabaseError("Database programming error occurred.") from e
+        except SQLAlchemyError as e:
+            logger.error(f"Database error occurred: {e}", exc_info=True)
+            raise DatabaseError("Database error occurred.") from e
+
+    def _field(self, field: str) -> Any:
+        """
+        Raises:
+            ValueError: If the model has no such field
+        """
+        model_field = getattr(self.model, field, None)
+        if model_field is None:
+            raise ValueError(f"Field '{field}' does not exist in the model.")
+        return model_field
+
     async def get_by_field(
-        self, field: str, value: Union[str, int]
-    ) -> Optional[ModelType]:
+        self,
+        field: str,
+        value: Union[str, int],
+        as_rows: bool = False,
+        writer: bool = False,
+    ) -> Union[ModelType, RowMapping, None]:
         """
         Fetch all instances of a Model by a specific field
 
         Args:
             params (str): Field to fetch data
             id (int): Record ID to match
+            as_rows (bool): Return a read-only row mapping of the table columns
+                instead of an ORM instance
+            writer (bool): Read from the writer instead of a replica, for
+                results that must not lag behind it
 
         Raises:
             NoResultFound: If record with ID doesn't exist
             DatabaseError: If database update fails
         """
         try:
-            model_field = getattr(self.model, field, None)
-
-            if model_field is None:
-                raise ValueError(f"Field '{field}' does not exist in the model.")
-
-            query = select(self.model).where(model_field == value)
-
-            result = await self.session.execute(query)
-            return result.scalars().first()
+            query = self._statement(
+                ("get_by_field", field, as_rows),
+                lambda: select(*(self.columns if as_rows else [self.model])).where(
+                    self._field(field) == bindparam("value")
+                ),
+            )
+            result = await self.session.execute(
+                query,
+                {"value": value},
+                bind_arguments={"replica": False} if writer else None,
+            )
+            return result.mappings().first() if as_rows else result.scalars().first()
         except ProgrammingError as e:
             logger.error(f"Database table does not exist: {e}", exc_info=True)
             error_code = getattr(e.orig, "sqlstate", None)
@@ -134,36 +721,107 @@ class BaseRepo(Generic[ModelType]):
             logger.error(f"Database error occurred: {e}", exc_info=True)
             raise DatabaseError("Database error occurred.") from e
 
+    def _update_by_id_statement(
+        self, fields: Tuple[str, ...], changed_only: bool, versioned: bool
+    ):
+        """
+        Build the UPDATE ... RETURNING statement of `update_by_id` for a set
+        of fields, with the values bound as `value_<field>` and the expected
+        versions, if any, as `expected_version`.
+        """
+        values = {field: bindparam(f"value_{field}") for field in fields}
+        query = (
+            update(self.model)
+            .where(self.model.id == bindparam("record_id"))
+            .values(values)
+            .returning(self.model)
+        )
+        if versioned:
+            query = query.where(
+                self._field("version").in_(bindparam("expected_version", expanding=True))
+            )
+        if changed_only:
+            query = query.where(
+                or_(
+                    *(
+                        self._field(field).is_distinct_from(value)
+                        for field, value in values.items()
+                    )
+                )
+            )
+        return query
+
     async def update_by_id(
         self,
         id: int,
         params: dict,
         synchronize_session: SynchronizeSessionEnum = False,
-    ) -> None:
+        changed_only: bool = False,
+        expected_version: Optional[Union[int, Collection[int]]] = None,
+    ) -> ModelType:
         """
-        Update a model instance by ID.
+        Update a model instance by ID with a single UPDATE ... RETURNING
+        statement. The change is committed by the surrounding transaction.
+
+        With `expected_version`, the row is only written if its `version`
+        still matches, so concurrent writers are detected without locking.
+        Several versions may be given, any of which is accepted.
 
         Args:
             id (int): Record ID to update
             params (Dict[str, Any]): Fields and values to update
             synchronize_session (SynchronizeSessionEnum, optional): Synchronization strategy
+            changed_only (bool, optional): Only write the row if at least one
+                field differs from `params`. Defaults to False
+            expected_version (Optional[Union[int, Collection[int]]], optional):
+                Version, or versions, the record must have. Defaults to None
+
+        Returns:
+            ModelType: The updated model instance
 
         Raises:
             NoResultFound: If record with ID doesn't exist
+            PreconditionFailedException: If the record has another version
+            UnprocessableEntity: If `changed_only` is set and nothing differs
             DatabaseError: If database update fails
         """
+        versioned = expected_version is not None
+        if isinstance(expected_version, int):
+            expected_version = [expected_version]
         try:
-            query = (
-                update(self.model)
-                .where(self.model.id == id)
-                .values(**params)
-                .execution_options(synchronize_session=synchronize_session)
+            query = self._statement(
+                ("update_by_id", tuple(params), changed_only, versioned),
+                lambda: self._update_by_id_statement(
+                    tuple(params), changed_only, versioned
+                ),
             )
-            result = await self.session.execute(query)
-            await self.session.commit()
-            if result.rowcount == 0:
+            values = {f"value_{field}": value for field, value in params.items()}
+            if versioned:
+                values["expected_version"] = list(expected_version)
+            result = await self.session.execute(
+                query,
+                {"record_id": id, **values},
+                execution_options={
+                    "synchronize_session": synchronize_session,
+                    "populate_existing": True,
+                },
+            )
+            instance = result.scalars().first()
+            if instance is not None:
+                self._changed([id])
+                return instance
+            if not (changed_only or versioned):
+                raise NoResultFound(f"No record found with id {id}")
+
+            # Nothing matched: tell a missing record from a failed condition.
+            current = await self.get_by_field("id", id, as_rows=True)
+            if current is None:
                 raise NoResultFound(f"No record found with id {id}")
-            return {"message": "Record updated successfully"}
+            if versioned and current["version"] not in expected_version:
+                raise PreconditionFailedException(
+                    f"Record with id {id} was modified concurrently"
+                )
+            raise UnprocessableEntity("No updates provided")
         except NoResultFound:
             logger.warning(f"No record found with id {id}")
             raise
@@ -181,6 +839,57 @@ class BaseRepo(Generic[ModelType]):
             logger.error(f"Database error occurred: {e}", exc_info=True)
             raise DatabaseError from e
 
+    async def update_many(
+        self,
+        params: dict,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Update every model instance matching an ID list or a filter with one
+        `UPDATE ... RETURNING id` statement.
+
+        Args:
+            params (Dict[str, Any]): Fields and values to update
+            ids (Optional[List[int]]): Record IDs to update
+            filters (Optional[dict]): Filter selecting the records to update,
+                used when `ids` is not given
+            after (Optional[int]): Only update filtered records with a greater ID
+            limit (Optional[int]): Maximum number of filtered records to update
+
+        Returns:
+            List[int]: IDs of the updated records
+
+        Raises:
+            DatabaseError: If database update fails
+        """
+        try:
+            query = (
+                update(self.model)
+                .where(*self._selection(ids, filters, after, limit))
+                .values(**params)
+                .returning(self.model.id)
+            )
+            result = await self.session.execute(query)
+            ids = list(result.scalars().all())
+            self._changed(ids)
+            return ids
+        except IntegrityError as e:
+            logger.error(f"IntegrityError occurred: {e}", exc_info=True)
+            raise DatabaseError from e
+        except ProgrammingError as e:
+            error_code = getattr(e.orig, "sqlstate", None)
+            if error_code == UndefinedTableError.sqlstate:
+                logger.error("Database table does not exist.",exc_info=True)
+
+            logger.error("Database programming error occurred.",exc_info=True)
+            raise DatabaseError from e
+        except SQLAlchemyError as e:
+            logger.error(f"Database error occurred: {e}", exc_info=True)
+            raise DatabaseError from e
+
     async def delete(self, model: ModelType) -> None:
         """
         Delete a model instance
@@ -192,6 +901,7 @@ class BaseRepo(Generic[ModelType]):
         """
         try:
             await self.session.delete(model)
+            self._changed([model.id])
         except SQLAlchemyError as e:
             logger.error(f"Database error occurred: {e}", exc_info=True)
             raise DatabaseError from e
@@ -200,32 +910,37 @@ class BaseRepo(Generic[ModelType]):
         self,
         id: int,
         synchronize_session: SynchronizeSessionEnum = False,
-    ) -> None:
+    ) -> int:
         """
-        Delete a model instance by ID.
+        Delete a model instance by ID with a single DELETE ... RETURNING id.
 
         Args:
             id (int): Record ID to delete
 
         Returns:
-            bool: True if deletion was successful
+            int: The ID of the deleted record
 
         Raises:
             NoResultFound: If record with ID doesn't exist
             DatabaseError: If database deletion fails
         """
         try:
-            query = (
-                delete(self.model)
-                .where(self.model.id == id)
-                .returning(self.model)
-                .execution_options(synchronize_session=synchronize_session)
+            query = self._statement(
+                ("delete_by_id",),
+                lambda: delete(self.model)
+                .where(self.model.id == bindparam("record_id"))
+                .returning(self.model.id),
             )
-            result = await self.session.execute(query)
-            deleted_row = result.scalar()
-            if not deleted_row:
-                logger.warning(f"No record found with id {id}")
+            result = await self.session.execute(
+                query,
+                {"record_id": id},
+                execution_options={"synchronize_session": synchronize_session},
+            )
+            deleted_id = result.scalar()
+            if deleted_id is None:
                 raise NoResultFound(f"No record found with id {id}")
+            self._changed([deleted_id])
+            return deleted_id
         except NoResultFound:
             logger.warning(f"No record found with id {id}")
             raise
@@ -243,6 +958,54 @@ class BaseRepo(Generic[ModelType]):
             logger.error(f"Database error occurred: {e}", exc_info=True)
             raise DatabaseError from e
         
+    async def delete_many(
+        self,
+        ids: Optional[List[int]] = None,
+        filters: Optional[dict] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Delete every model instance matching an ID list or a filter with one
+        `DELETE ... RETURNING id` statement.
+
+        Args:
+            ids (Optional[List[int]]): Record IDs to delete
+            filters (Optional[dict]): Filter selecting the records to delete,
+                used when `ids` is not given
+            after (Optional[int]): Only delete filtered records with a greater ID
+            limit (Optional[int]): Maximum number of filtered records to delete
+
+        Returns:
+            List[int]: IDs of the deleted records
+
+        Raises:
+            DatabaseError: If database deletion fails
+        """
+        try:
+            query = (
+                delete(self.model)
+                .where(*self._selection(ids, filters, after, limit))
+                .returning(self.model.id)
+            )
+            result = await self.session.execute(query)
+            ids = list(result.scalars().all())
+            self._changed(ids)
+            return ids
+        except IntegrityError as e:
+            logger.error(f"Integrity Error occurred: {e}", exc_info=True)
+            raise DatabaseError from e
+        except ProgrammingError as e:
+            error_code = getattr(e.orig, "sqlstate", None)
+            if error_code == UndefinedTableError.sqlstate:
+                logger.error("Database table does not exist.",exc_info=True)
+
+            logger.error("Database programming error occurred.",exc_info=True)
+            raise DatabaseError from e
+        except SQLAlchemyError as e:
+            logger.error(f"Database error occurred: {e}", exc_info=True)
+            raise DatabaseError from e
+
     async def refresh(self, instance: ModelType) -> None:
         """
         Refresh the given instance from the database.
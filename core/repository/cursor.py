@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+from core.exceptions.base import BadRequestException
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(sort: str, value: Any, id: int) -> str:
+    """
+    Encode the position of a row in a keyset-paginated listing.
+
+    Args:
+        sort (str): Name of the field the listing is ordered by
+        value (Any): Value of the sort field for the last row of the page
+        id (int): ID of the last row of the page, used as tie-breaker
+
+    Returns:
+        str: An opaque, URL-safe cursor token
+    """
+    payload = json.dumps([sort, _encode_value(value), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, Any, int]:
+    """
+    Decode a cursor token produced by `encode_cursor`.
+
+    Args:
+        token (str): The opaque cursor token
+
+    Returns:
+        Tuple[str, Any, int]: The sort field, sort value and ID of the last row
+
+    Raises:
+        BadRequestException: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        sort, value, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(sort, str) or not isinstance(id, int):
+            raise ValueError("Invalid cursor payload")
+        return sort, _decode_value(value), id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise BadRequestException("Invalid pagination cursor") from e
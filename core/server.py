@@ -1,6 +1,8 @@
+from contextlib import asynccontextmanager
 from typing import List
 
 from fastapi import FastAPI
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -8,8 +10,16 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.exceptions import ExceptionMiddleware
 
 from api import router
+from core.cache import InvalidationListener
 from core.config import config
+from core.database.health import prober
+from core.database.session import replicas
+from core.exceptions import CustomException
+from core.fastapi.middleware.compression import CompressionMiddleware
+from core.fastapi.middleware.metrics import MetricsMiddleware
 from core.fastapi.middleware.sqlalchemy import SQLAlchemyMiddleware
+from core.fastapi.responses import FastJSONResponse
+from core.metrics import exceptions
 
 
 def init_routers(app_: FastAPI) -> None:
@@ -43,6 +53,15 @@ async def global_exception_handler(request, exc):
     )
 
 
+async def custom_exception_handler(request, exc: CustomException):
+    """
+    Count the application exception by class before rendering it like any
+    other HTTP exception.
+    """
+    exceptions.inc(type(exc).__name__)
+    return await http_exception_handler(request, exc)
+
+
 def make_middleware() -> List[Middleware]:
     """
     Configure and create middleware stack for the FastAPI application.
@@ -50,7 +69,9 @@ def make_middleware() -> List[Middleware]:
     Returns:
         List[Middleware]: A list of middleware configurations including:
             - CORS middleware with all origins allowed
+            - Response compression middleware
             - Exception handling middleware
+            - Request metrics middleware
             - SQLAlchemy session middleware
     """
     middleware = [
@@ -60,13 +81,41 @@ def make_middleware() -> List[Middleware]:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=[
+                "X-Next-Cursor",
+                "X-Total-Count",
+                "ETag",
+                "Last-Modified",
+                "Server-Timing",
+            ],
         ),
+        Middleware(CompressionMiddleware),
         Middleware(ExceptionMiddleware, handlers={Exception: global_exception_handler}),
+        Middleware(MetricsMiddleware),
         Middleware(SQLAlchemyMiddleware),
     ]
     return middleware
 
 
+@asynccontextmanager
+async def lifespan(app_: FastAPI):
+    """
+    Run the background services of the application: the listener evicting
+    cached rows written by other workers, the health checks of the read
+    replicas and the database probe readiness is reported from.
+    """
+    listener = InvalidationListener()
+    await listener.start()
+    await replicas.start()
+    await prober.start()
+    try:
+        yield
+    finally:
+        await prober.stop()
+        await replicas.stop()
+        await listener.stop()
+
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application.
@@ -77,7 +126,10 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url=None if config.ENVIRONMENT == "production" else "/docs",
         middleware=make_middleware(),
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
+    app_.add_exception_handler(CustomException, custom_exception_handler)
     init_routers(app_=app_)
 
     return app_
@@ -0,0 +1,83 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong entity tag from the values identifying a representation.
+
+    Args:
+        *parts (Any): Values that change whenever the representation does,
+            such as IDs and modification times
+
+    Returns:
+        str: The quoted entity tag
+    """
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts).encode(), digest_size=12
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+def version_etag(version: int, *parts: Any) -> str:
+    """
+    Build a strong entity tag `"<version>-<digest>"` for a versioned record.
+    The version can be read back with `parse_version_etag`; the digest of
+    `parts` tells apart records that happen to share a version.
+
+    Args:
+        version (int): Version of the record
+        *parts (Any): Further values identifying the representation
+
+    Returns:
+        str: The quoted entity tag
+    """
+    return f'"{version}-{make_etag(*parts).strip(chr(34))[:16]}"'
+
+
+def parse_version_etag(if_match: str) -> Optional[int]:
+    """
+    Read the version out of an `If-Match` header holding a single tag built
+    by `version_etag`. Weak tags never match, as the header requires. The
+    digest is not checked; build the tag again with `version_etag` for that.
+
+    Returns:
+        Optional[int]: The version, or None if the header is not such a tag
+    """
+    tag = if_match.strip()
+    if tag.startswith("W/") or len(tag) < 2 or tag[0] != '"' or tag[-1] != '"':
+        return None
+    version = tag[1:-1].split("-", 1)[0]
+    return int(version) if version.isdigit() else None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an `If-None-Match` header matches an entity tag. Weak comparison
+    is used, as the header requires.
+
+    Args:
+        if_none_match (Optional[str]): Value of the request header
+        etag (str): The current entity tag
+
+    Returns:
+        bool: True if the client's representation is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a timestamp for the `Last-Modified` header. Naive timestamps are
+    taken as UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
@@ -0,0 +1,49 @@
+import json
+from collections.abc import Mapping
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def json_default(value: Any) -> Any:
+    """
+    Serialize the values the stdlib `json` module does not know about.
+
+    Args:
+        value (Any): The value to serialize
+
+    Returns:
+        Any: A JSON serializable representation of the value
+
+    Raises:
+        TypeError: If the value cannot be serialized
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> str:
+    """
+    Serialize a value to a compact JSON string.
+    """
+    return json.dumps(value, default=json_default, separators=(",", ":"))
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """
+    Serialize a value to compact UTF-8 encoded JSON, using `orjson` when it
+    is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default)
+    return dumps(value).encode()
@@ -0,0 +1,107 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Tuple, Union
+
+MAX_LINE_LENGTH = 1024 * 1024
+
+Record = Tuple[int, Union[dict[str, Any], ValueError]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 encoded chunks into lines, keeping the line
+    terminator. Only the current, incomplete line is held in memory.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw byte stream, e.g. `request.stream()`
+
+    Yields:
+        str: The next line
+
+    Raises:
+        ValueError: If a line is longer than MAX_LINE_LENGTH or not valid UTF-8
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        try:
+            pending += decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise ValueError("Request body is not valid UTF-8") from e
+        *lines, pending = pending.split("\n")
+        if len(pending) > MAX_LINE_LENGTH:
+            raise ValueError(f"Line longer than {MAX_LINE_LENGTH} characters")
+        for line in lines:
+            yield f"{line}\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    Parse newline-delimited JSON objects from a byte stream. Blank lines are
+    skipped.
+
+    Yields:
+        Record: The line number and either the parsed object or the error
+            that prevented parsing it
+    """
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield line_number, ValueError("Expected a JSON object")
+            continue
+        yield line_number, record
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    Parse CSV records from a byte stream. The first record is the header;
+    quoted fields may span several lines. Empty fields are left out of the
+    record so that defaults apply.
+
+    Yields:
+        Record: The line number the record starts on and either the record
+            or the error that prevented parsing it
+    """
+    header = None
+    record_lines = []
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        record_lines.append(line)
+        text = "".join(record_lines)
+        if text.count('"') % 2:
+            if len(text) > MAX_LINE_LENGTH:
+                raise ValueError(f"Record longer than {MAX_LINE_LENGTH} characters")
+            continue
+        start_line = line_number - len(record_lines) + 1
+        record_lines = []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start_line, ValueError(
+                f"Expected {len(header)} fields, got {len(values)}"
+            )
+            continue
+        yield start_line, {
+            name: value for name, value in zip(header, values) if value != ""
+        }
+
+    if record_lines:
+        yield line_number - len(record_lines) + 1, ValueError("Unterminated quote")
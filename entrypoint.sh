@@ -1,8 +1,5 @@
 #!/bin/sh
 
-# Scrip for running initial migration
-poetry run alembic revision --autogenerate -m "Initial Migration"
-
 # Run Alembic migrations
 poetry run alembic upgrade head
 
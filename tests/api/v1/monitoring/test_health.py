@@ -1,6 +1,10 @@
 import pytest
 from httpx import AsyncClient
 
+from core.config import config
+from core.database.health import prober
+from core.database.session import engines
+
 
 @pytest.mark.asyncio
 async def test_health(client: AsyncClient):
@@ -11,3 +15,36 @@ async def test_health(client: AsyncClient):
     response = response.json()
     assert response["status"] == "healthy"
     assert response["database_connected"] == True
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(client: AsyncClient):
+    response = await client.get("v1/health/pool")
+    assert response.status_code == 200
+    writer = response.json()["writer"]
+    assert writer["size"] == config.DB_POOL["pool_size"]
+    assert writer["timeout"] == config.DB_POOL["pool_timeout"]
+    assert {"checked_out", "idle", "overflow", "wait_time_avg"} <= writer.keys()
+
+
+@pytest.mark.asyncio
+async def test_liveness(client: AsyncClient):
+    response = await client.get("v1/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_answers_from_last_probe(client: AsyncClient, monkeypatch):
+    # Pooled connections of the global engine belong to earlier tests' loops
+    await engines["writer"].dispose(close=False)
+    await prober.probe()
+    response = await client.get("v1/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["pool"]["writer"]["size"] == config.DB_POOL["pool_size"]
+
+    monkeypatch.setattr(prober, "checked_at", prober.checked_at - 4 * prober.interval)
+    response = await client.get("v1/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
@@ -0,0 +1,22 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_metrics(client: AsyncClient):
+    await client.get("v1/tasks/2147483647")
+
+    response = await client.get("metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/v1/tasks/{task_id}",status="404"}'
+        in body
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/v1/tasks/{task_id}"}'
+        in body
+    )
+    assert 'app_exceptions_total{exception="NotFoundException"}' in body
+    assert 'db_pool_connections{engine="writer",state="idle"}' in body
@@ -1,6 +1,11 @@
+import csv
+import io
+import json
+
 import pytest
 from httpx import AsyncClient
 
+from core.repository.cursor import encode_cursor
 from tests.factory.task import create_fake_task
 
 
@@ -93,6 +98,17 @@ async def test_update_task(client: AsyncClient, db_session) -> None:
     assert response.json()["id"] == task_id
 
 
+@pytest.mark.asyncio
+async def test_update_task_no_changes(client: AsyncClient, db_session) -> None:
+    """Test update task with the values it already has."""
+
+    fake_task = create_fake_task()
+    await client.post("/v1/tasks/", json=fake_task)
+
+    response = await client.put(f"/v1/tasks/{fake_task['id']}", json=fake_task)
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_update_task_not_found(client: AsyncClient, db_session) -> None:
     """Test update task not found."""
@@ -120,3 +136,482 @@ async def test_delete_task_not_found(client: AsyncClient, db_session) -> None:
 
     response = await client.delete("/v1/tasks/1")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_with_cursor(client: AsyncClient, db_session) -> None:
+    """Test cursor pagination of tasks."""
+
+    for _ in range(3):
+        await client.post("/v1/tasks/", json=create_fake_task())
+
+    first_page = await client.get("/v1/tasks/", params={"limit": 2})
+    assert first_page.status_code == 200
+    assert len(first_page.json()) == 2
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = await client.get("/v1/tasks/", params={"limit": 2, "after": cursor})
+    assert second_page.status_code == 200
+    assert second_page.json()[0]["id"] > first_page.json()[-1]["id"]
+
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_with_invalid_cursor(
+    client: AsyncClient, db_session
+) -> None:
+    """Test cursor pagination with a malformed cursor."""
+
+    response = await client.get("/v1/tasks/", params={"after": "not-a-cursor"})
+    assert response.status_code == 400
+
+    tampered = encode_cursor("-created_at", "yesterday", 1)
+    response = await client.get(
+        "/v1/tasks/", params={"sort": "-created_at", "after": tampered}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks(client: AsyncClient, db_session) -> None:
+    """Test bulk task creation with a conflicting task."""
+
+    existing = await client.post("/v1/tasks/", json=create_fake_task())
+    existing_id = existing.json()["id"]
+    fake_tasks = [create_fake_task(id=existing_id), create_fake_task()]
+    while fake_tasks[1]["id"] == existing_id:
+        fake_tasks[1] = create_fake_task()
+
+    response = await client.post("/v1/tasks/bulk", json={"tasks": fake_tasks})
+    assert response.status_code == 201
+    assert [task["id"] for task in response.json()["created"]] == [
+        fake_tasks[1]["id"]
+    ]
+    assert response.json()["conflicts"] == [
+        {"index": 0, "id": existing_id, "detail": "Unique constraint violation"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tasks(client: AsyncClient, db_session) -> None:
+    """Test bulk update of tasks by id."""
+
+    first = await client.post("/v1/tasks/", json=create_fake_task(completed=False))
+    second = await client.post("/v1/tasks/", json=create_fake_task(completed=False))
+    ids = [first.json()["id"], second.json()["id"]]
+
+    response = await client.patch(
+        "/v1/tasks/", json={"ids": ids, "values": {"completed": True}}
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+
+    task = await client.get(f"/v1/tasks/{ids[0]}")
+    assert task.json()["completed"] is True
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tasks_without_selection(
+    client: AsyncClient, db_session
+) -> None:
+    """Test bulk update without ids or filter."""
+
+    response = await client.patch("/v1/tasks/", json={"values": {"completed": True}})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_tasks(client: AsyncClient, db_session) -> None:
+    """Test bulk delete of tasks by id."""
+
+    task = await client.post("/v1/tasks/", json=create_fake_task())
+    task_id = task.json()["id"]
+
+    response = await client.request(
+        "DELETE", "/v1/tasks/", json={"ids": [task_id, task_id]}
+    )
+    assert response.status_code == 200
+    assert response.json()["deleted"] == 1
+
+    response = await client.get(f"/v1/tasks/{task_id}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_ndjson(client: AsyncClient, db_session) -> None:
+    """Test streaming export of tasks as NDJSON."""
+
+    task = await client.post("/v1/tasks/", json=create_fake_task(completed=True))
+    task_id = task.json()["id"]
+
+    response = await client.get("/v1/tasks/export", params={"completed": True})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert task_id in [row["id"] for row in rows]
+    assert all(row["completed"] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_csv(client: AsyncClient, db_session) -> None:
+    """Test streaming export of tasks as CSV."""
+
+    task = await client.post("/v1/tasks/", json=create_fake_task())
+    task_id = task.json()["id"]
+
+    response = await client.get("/v1/tasks/export", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert str(task_id) in [row["id"] for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_ndjson(client: AsyncClient, db_session) -> None:
+    """Test streaming import of tasks from NDJSON."""
+
+    existing = await client.post("/v1/tasks/", json=create_fake_task(id=300001))
+    new_task = create_fake_task(id=300002)
+    body = "\n".join(
+        [
+            json.dumps(new_task),
+            json.dumps(create_fake_task(id=existing.json()["id"])),
+            json.dumps({"id": 300003}),
+            "not json",
+        ]
+    )
+
+    response = await client.post(
+        "/v1/tasks/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["processed"] == 4
+    assert report["created"] == 1
+    assert report["failed"] == 3
+    assert [error["line"] for error in report["errors"]] == [3, 4, 2]
+
+    task = await client.get("/v1/tasks/300002")
+    assert task.json()["title"] == new_task["title"]
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_rejected_by_database(
+    client: AsyncClient, db_session
+) -> None:
+    """Test that rows the database rejects fail alone, not their batch."""
+
+    valid = create_fake_task(id=300004)
+    body = "\n".join(
+        [
+            json.dumps(valid),
+            json.dumps({**create_fake_task(id=300005), "title": "nul \u0000 byte"}),
+            json.dumps({**create_fake_task(id=300006), "completed": None}),
+            json.dumps({**create_fake_task(id=300007), "description": "x" * 300}),
+            json.dumps(create_fake_task(id=2**63)),
+        ]
+    )
+
+    response = await client.post(
+        "/v1/tasks/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == 1
+    assert sorted(error["line"] for error in report["errors"]) == [2, 3, 4, 5]
+
+    task = await client.get("/v1/tasks/300004")
+    assert task.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_csv(client: AsyncClient, db_session) -> None:
+    """Test streaming import of tasks from CSV."""
+
+    body = 'id,title,description,completed\n300004,"Buy\nMilk",,true\n'
+
+    response = await client.post(
+        "/v1/tasks/import", params={"format": "csv"}, content=body
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+
+    task = await client.get("/v1/tasks/300004")
+    assert task.json()["title"] == "Buy\nMilk"
+    assert task.json()["completed"] is True
+
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_with_filters_and_sort(
+    client: AsyncClient, db_session
+) -> None:
+    """Test filtering and sorting of the task listing."""
+
+    for _ in range(3):
+        await client.post(
+            "/v1/tasks/",
+            json=create_fake_task(title="Quarterly report draft", completed=True),
+        )
+
+    params = {
+        "title_prefix": "Quarterly report",
+        "completed": True,
+        "sort": "-created_at",
+        "limit": 2,
+    }
+    first_page = await client.get("/v1/tasks/", params=params)
+    assert first_page.status_code == 200
+    tasks = first_page.json()
+    assert all(task["title"].startswith("Quarterly report") for task in tasks)
+    assert tasks[0]["created_at"] >= tasks[1]["created_at"]
+
+    second_page = await client.get(
+        "/v1/tasks/", params={**params, "after": first_page.headers["X-Next-Cursor"]}
+    )
+    assert second_page.status_code == 200
+    assert tasks[-1]["id"] not in [task["id"] for task in second_page.json()]
+
+    mismatch = await client.get(
+        "/v1/tasks/", params={"after": first_page.headers["X-Next-Cursor"]}
+    )
+    assert mismatch.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(client: AsyncClient, db_session) -> None:
+    """Test full-text search ranks title matches first."""
+
+    in_description = await client.post(
+        "/v1/tasks/",
+        json=create_fake_task(title="Office errands", description="Buy xylograph ink"),
+    )
+    in_title = await client.post(
+        "/v1/tasks/",
+        json=create_fake_task(title="Order xylographs", description="For the lobby"),
+    )
+
+    response = await client.get("/v1/tasks/search", params={"q": "xylograph"})
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()] == [
+        in_title.json()["id"],
+        in_description.json()["id"],
+    ]
+    assert "search_vector" not in response.json()[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["exact", "estimate", "cached"])
+async def test_get_all_tasks_with_total_count(
+    client: AsyncClient, db_session, mode: str
+) -> None:
+    """Test the X-Total-Count header of the task listing."""
+
+    await client.post("/v1/tasks/", json=create_fake_task(title="Count me in"))
+
+    response = await client.get(
+        "/v1/tasks/", params={"count": mode, "title_prefix": "Count me"}
+    )
+    assert response.status_code == 200
+    assert int(response.headers["X-Total-Count"]) >= 0
+    if mode == "exact":
+        assert int(response.headers["X-Total-Count"]) == len(response.json())
+
+
+@pytest.mark.asyncio
+async def test_create_task_on_conflict(client: AsyncClient, db_session) -> None:
+    """Test creating a task whose ID already exists with on_conflict."""
+
+    task = create_fake_task()
+    await client.post("/v1/tasks/", json=task)
+
+    ignored = await client.post(
+        "/v1/tasks/",
+        json={**task, "title": "Ignored title"},
+        params={"on_conflict": "ignore"},
+    )
+    assert ignored.status_code == 200
+    assert ignored.json()["title"] == task["title"]
+
+    updated = await client.post(
+        "/v1/tasks/",
+        json={**task, "title": "Updated title"},
+        params={"on_conflict": "update"},
+    )
+    assert updated.status_code == 200
+    assert updated.json()["title"] == "Updated title"
+
+
+@pytest.mark.asyncio
+async def test_upsert_task(client: AsyncClient, db_session) -> None:
+    """Test create-or-replace of a task with PUT."""
+
+    task_id = create_fake_task()["id"]
+    body = {"title": "Upserted task", "description": None, "completed": False}
+
+    created = await client.put(
+        f"/v1/tasks/{task_id}", json=body, params={"upsert": True}
+    )
+    assert created.status_code == 201
+    assert created.json()["id"] == task_id
+
+    replaced = await client.put(
+        f"/v1/tasks/{task_id}",
+        json={**body, "completed": True},
+        params={"upsert": True},
+    )
+    assert replaced.status_code == 200
+    assert replaced.json()["completed"] is True
+
+
+@pytest.mark.asyncio
+async def test_get_task_cache_invalidated_on_update(
+    client: AsyncClient, db_session
+) -> None:
+    """Test that a cached task is refreshed after it is updated."""
+
+    fake_task = create_fake_task()
+    await client.post("/v1/tasks/", json=fake_task)
+    await client.get(f"/v1/tasks/{fake_task['id']}")
+    cached = await client.get(f"/v1/tasks/{fake_task['id']}")
+    assert cached.json()["title"] == fake_task["title"]
+
+    await client.put(
+        f"/v1/tasks/{fake_task['id']}", json={**fake_task, "title": "Fresh title"}
+    )
+    response = await client.get(f"/v1/tasks/{fake_task['id']}")
+    assert response.json()["title"] == "Fresh title"
+
+    stats = (await client.get("/v1/health/cache")).json()["tasks"]
+    assert stats["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_get_task_not_modified(client: AsyncClient, db_session) -> None:
+    """Test conditional GET of a task with If-None-Match."""
+
+    fake_task = create_fake_task()
+    await client.post("/v1/tasks/", json=fake_task)
+
+    response = await client.get(f"/v1/tasks/{fake_task['id']}")
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    not_modified = await client.get(
+        f"/v1/tasks/{fake_task['id']}", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    await client.put(
+        f"/v1/tasks/{fake_task['id']}", json={**fake_task, "title": "Modified title"}
+    )
+    modified = await client.get(
+        f"/v1/tasks/{fake_task['id']}", headers={"If-None-Match": etag}
+    )
+    assert modified.status_code == 200
+    assert modified.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_get_task_validators_exposed_cross_origin(
+    client: AsyncClient, db_session
+) -> None:
+    """Test that browsers on other origins can read the task validators."""
+
+    fake_task = create_fake_task()
+    await client.post("/v1/tasks/", json=fake_task)
+
+    response = await client.get(
+        f"/v1/tasks/{fake_task['id']}", headers={"Origin": "http://example.com"}
+    )
+    exposed = response.headers["Access-Control-Expose-Headers"].lower()
+    assert "etag" in exposed and "last-modified" in exposed
+
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_not_modified(client: AsyncClient, db_session) -> None:
+    """Test conditional GET of a task page with If-None-Match."""
+
+    await client.post("/v1/tasks/", json=create_fake_task())
+
+    response = await client.get("/v1/tasks/", params={"sort": "-created_at"})
+    not_modified = await client.get(
+        "/v1/tasks/",
+        params={"sort": "-created_at"},
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_update_task_if_match(client: AsyncClient, db_session) -> None:
+    """Test optimistic concurrency control of task updates with If-Match."""
+
+    fake_task = create_fake_task()
+    created = await client.post("/v1/tasks/", json=fake_task)
+    assert created.json()["version"] == 1
+    etag = (await client.get(f"/v1/tasks/{fake_task['id']}")).headers["ETag"]
+
+    first = await client.put(
+        f"/v1/tasks/{fake_task['id']}",
+        json={**fake_task, "title": "First writer"},
+        headers={"If-Match": etag},
+    )
+    assert first.status_code == 200
+    assert first.json()["version"] == 2
+    assert first.headers["ETag"] != etag
+
+    second = await client.put(
+        f"/v1/tasks/{fake_task['id']}",
+        json={**fake_task, "title": "Second writer"},
+        headers={"If-Match": etag},
+    )
+    assert second.status_code == 412
+
+    retried = await client.put(
+        f"/v1/tasks/{fake_task['id']}",
+        json={**fake_task, "title": "Second writer"},
+        headers={"If-Match": first.headers["ETag"]},
+    )
+    assert retried.status_code == 200
+    assert retried.json()["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_update_task_if_match_checks_whole_etag(
+    client: AsyncClient, db_session
+) -> None:
+    """Test that If-Match needs the task's own ETag, not only its version."""
+
+    fake_task, other_task = create_fake_task(), create_fake_task()
+    await client.post("/v1/tasks/", json=fake_task)
+    await client.post("/v1/tasks/", json=other_task)
+    other_etag = (await client.get(f"/v1/tasks/{other_task['id']}")).headers["ETag"]
+
+    for etag in ('"1-deadbeef"', other_etag):
+        response = await client.put(
+            f"/v1/tasks/{fake_task['id']}",
+            json={**fake_task, "title": "Blind write"},
+            headers={"If-Match": etag},
+        )
+        assert response.status_code == 412
+
+
+@pytest.mark.asyncio
+async def test_update_task_if_match_any_tag(client: AsyncClient, db_session) -> None:
+    """Test that If-Match holding several tags accepts the task's current one."""
+
+    fake_task = create_fake_task()
+    await client.post("/v1/tasks/", json=fake_task)
+    etag = (await client.get(f"/v1/tasks/{fake_task['id']}")).headers["ETag"]
+
+    response = await client.put(
+        f"/v1/tasks/{fake_task['id']}",
+        json={**fake_task, "title": "Any tag"},
+        headers={"If-Match": f'"1-deadbeef", {etag}'},
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from core.cache import get_cache, mark_changed
+from core.cache.invalidation import apply_payload, encode_changes
+from core.config import config
+
+
+@pytest.fixture(autouse=True)
+def no_publish(monkeypatch):
+    monkeypatch.setattr(config, "CACHE_INVALIDATION_CHANNEL", "")
+
+
+class TestInvalidation:
+    def test_evicted_on_commit(self):
+        # Given
+        cache = get_cache("invalidation_test")
+        session = Session()
+        mark_changed(session, "invalidation_test", [1])
+        cache.set(1, "read before commit")
+
+        # When
+        session.commit()
+
+        # Then
+        assert cache.get(1) is None
+        assert "changed_ids" not in session.info
+
+    def test_discarded_on_rollback(self):
+        # Given
+        session = Session()
+        mark_changed(session, "invalidation_test", [1])
+
+        # When
+        session.begin()
+        session.rollback()
+
+        # Then
+        assert "changed_ids" not in session.info
+
+    def test_payload_round_trip(self, monkeypatch):
+        # Given
+        monkeypatch.setattr(config, "CACHE_INVALIDATION_MAX_IDS", 2)
+        cache = get_cache("invalidation_test")
+        cache.set(1, "one")
+        cache.set(2, "two")
+        cache.set(3, "three")
+
+        # When
+        payloads = encode_changes({"invalidation_test": {1}})
+        for payload in payloads:
+            apply_payload(payload)
+
+        # Then
+        assert cache.get(1) is None and cache.get(2) == "two"
+        apply_payload(encode_changes({"invalidation_test": {1, 2, 3}})[0])
+        assert len(cache) == 0
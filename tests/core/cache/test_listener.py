@@ -0,0 +1,60 @@
+import asyncio
+
+import asyncpg
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core.cache import InvalidationListener, get_cache, mark_changed
+from core.config import config
+
+CHANNEL = "cache_invalidation_test"
+
+
+@pytest.mark.asyncio
+async def test_listener_evicts_notified_ids():
+    # Given
+    listener = InvalidationListener(channel=CHANNEL)
+    await listener.start()
+    await asyncio.wait_for(listener.listening.wait(), timeout=5)
+    cache = get_cache("listener_test")
+    cache.set(1, "cached")
+    engine = create_async_engine(config.POSTGRES_URL)
+
+    # When
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANNEL, "payload": '{"table": "listener_test", "ids": [1]}'},
+        )
+    for _ in range(50):
+        if cache.get(1) is None:
+            break
+        await asyncio.sleep(0.1)
+
+    # Then
+    assert cache.get(1) is None
+    await engine.dispose()
+    await listener.stop()
+
+
+@pytest.mark.asyncio
+async def test_commit_publishes_changed_ids(monkeypatch):
+    # Given
+    monkeypatch.setattr(config, "CACHE_INVALIDATION_CHANNEL", CHANNEL)
+    received = asyncio.Queue()
+    listener = await asyncpg.connect(InvalidationListener().dsn)
+    await listener.add_listener(CHANNEL, lambda *args: received.put_nowait(args[-1]))
+    engine = create_async_engine(config.POSTGRES_URL)
+    session = AsyncSession(engine)
+
+    # When
+    mark_changed(session, "listener_test", [2, 1])
+    await session.commit()
+
+    # Then
+    payload = await asyncio.wait_for(received.get(), timeout=5)
+    assert payload == '{"table": "listener_test", "ids": [1, 2]}'
+    await session.close()
+    await engine.dispose()
+    await listener.close()
@@ -0,0 +1,73 @@
+from core.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_get_set(self):
+        # Given
+        cache = TTLCache(maxsize=2, ttl=60)
+
+        # When
+        cache.set("a", 1)
+
+        # Then
+        assert cache.get("a") == 1
+        assert cache.get("b", "missing") == "missing"
+
+    def test_evicts_least_recently_used(self):
+        # Given
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        # When
+        cache.set("c", 3)
+
+        # Then
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+
+    def test_expires(self, monkeypatch):
+        # Given
+        cache = TTLCache(maxsize=2, ttl=5)
+        cache.set("a", 1)
+
+        # When
+        now = __import__("time").monotonic()
+        monkeypatch.setattr("core.cache.ttl.time.monotonic", lambda: now + 10)
+
+        # Then
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_stats(self):
+        # Given
+        cache = TTLCache(maxsize=1, ttl=60)
+        cache.set("a", 1)
+
+        # When
+        cache.get("a")
+        cache.get("b")
+        cache.set("b", 2)
+
+        # Then
+        assert cache.stats() == {
+            "size": 1,
+            "maxsize": 1,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 1,
+            "expirations": 0,
+        }
+
+    def test_set_skipped_after_delete(self):
+        # Given
+        cache = TTLCache(maxsize=2, ttl=60)
+        generation = cache.generation
+
+        # When
+        cache.delete("a")
+        cache.set("a", "stale", generation=generation)
+
+        # Then
+        assert cache.get("a") is None
@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import config
+from core.database.pool import InstrumentedPool, pool_stats
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_record_checkouts_and_timeouts() -> None:
+    engine = create_async_engine(
+        config.POSTGRES_URL,
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            busy = pool_stats(engine)
+            with pytest.raises(TimeoutError):
+                await engine.connect().start()
+        idle = pool_stats(engine)
+    finally:
+        await engine.dispose()
+
+    assert busy["checked_out"] == 1 and busy["idle"] == 0
+    assert idle["checked_out"] == 0 and idle["idle"] == 1
+    assert idle["checkouts"] == 2 and idle["timeouts"] == 1
+    assert idle["wait_time_max"] >= 0.05
@@ -0,0 +1,87 @@
+import logging
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import config
+from core.database import timing
+from core.database.timing import instrument_engine, parameter_shape
+from core.metrics import db_statement_duration
+
+
+def test_parameter_shape() -> None:
+    assert parameter_shape((1, "a", datetime.now(), [1, 2])) == (
+        "(int, str, datetime, list[2])"
+    )
+    assert parameter_shape({"id": 1, "title": None}) == "{id: int, title: NoneType}"
+    assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
+
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_times_statements() -> None:
+    durations = []
+    engine = create_async_engine(config.POSTGRES_URL)
+    instrument_engine(engine, "test", durations.append)
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            with pytest.raises(Exception):
+                await connection.execute(text("SELECT missing"))
+    finally:
+        await engine.dispose()
+
+    assert len(durations) == 1
+    sample = 'db_statement_duration_seconds_count{engine="test",operation="SELECT"}'
+    assert f"{sample} 1" in db_statement_duration.render()
+
+
+@pytest.mark.asyncio
+async def test_slow_statements_are_logged_with_plan(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(config, "SLOW_QUERY_THRESHOLD", 0)
+    monkeypatch.setattr(config, "SLOW_QUERY_EXPLAIN_RATE", 1)
+    engine = create_async_engine(config.POSTGRES_URL)
+    instrument_engine(engine, "test")
+    try:
+        async with engine.connect() as connection:
+            with caplog.at_level(logging.WARNING):
+                result = await connection.execute(
+                    text("SELECT CAST(:secret AS text) AS value"), {"secret": "hunter2"}
+                )
+            assert result.scalar() == "hunter2"
+    finally:
+        await engine.dispose()
+
+    [message] = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith("Slow statement on test")
+    ]
+    assert "parameters (str)" in message
+    assert "hunter2" not in message
+    assert '"Plan"' in message
+
+
+@pytest.mark.asyncio
+async def test_failed_explain_keeps_transaction_usable(monkeypatch) -> None:
+    monkeypatch.setattr(config, "SLOW_QUERY_THRESHOLD", 0)
+    monkeypatch.setattr(config, "SLOW_QUERY_EXPLAIN_RATE", 1)
+    monkeypatch.setattr(timing, "EXPLAIN_PREFIX", "EXPLAIN (FORMAT NOPE)")
+    engine = create_async_engine(config.POSTGRES_URL)
+    instrument_engine(engine, "test")
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(
+                text("CREATE TEMP TABLE explained (id int) ON COMMIT PRESERVE ROWS")
+            )
+            await connection.execute(text("INSERT INTO explained VALUES (1)"))
+            result = await connection.execute(text("SELECT count(*) FROM explained"))
+            assert result.scalar() == 1
+        # The only pooled connection, where the temporary table survives if
+        # the transaction committed
+        async with engine.connect() as connection:
+            result = await connection.execute(text("SELECT count(*) FROM explained"))
+            assert result.scalar() == 1
+    finally:
+        await engine.dispose()
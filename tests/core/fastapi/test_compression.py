@@ -0,0 +1,115 @@
+import gzip
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from core.fastapi.middleware.compression import CompressionMiddleware, negotiate
+
+BODY = "task " * 1000
+
+
+async def large(request):
+    return PlainTextResponse(BODY)
+
+
+async def tagged(request):
+    if request.headers.get("if-none-match") == '"abc"':
+        return Response(status_code=304, headers={"ETag": '"abc"'})
+    return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(10):
+            yield BODY
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+async def encoded(request):
+    return Response(
+        gzip.compress(BODY.encode()), headers={"Content-Encoding": "gzip"}
+    )
+
+
+app = CompressionMiddleware(
+    Starlette(
+        routes=[
+            Route("/large", large),
+            Route("/small", small),
+            Route("/stream", stream),
+            Route("/encoded", encoded),
+            Route("/tagged", tagged),
+        ]
+    ),
+    minimum_size=500,
+    encodings=("gzip",),
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path, compressed, expected",
+    [
+        ("/large", True, BODY),
+        ("/small", False, "ok"),
+        ("/stream", True, BODY * 10),
+        ("/encoded", True, BODY),
+    ],
+)
+async def test_compression(path: str, compressed: bool, expected: str) -> None:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert (response.headers.get("Content-Encoding") == "gzip") is compressed
+    assert response.text == expected
+
+
+@pytest.mark.asyncio
+async def test_compression_not_accepted() -> None:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.text == BODY
+
+
+@pytest.mark.asyncio
+async def test_compressed_etag_names_the_encoding() -> None:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        plain = await client.get("/tagged", headers={"Accept-Encoding": "identity"})
+        compressed = await client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+        revalidated = await client.get(
+            "/tagged",
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": compressed.headers["ETag"],
+            },
+        )
+
+    assert plain.headers["ETag"] == '"abc"'
+    assert compressed.headers["ETag"] == '"abc-gzip"'
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == '"abc-gzip"'
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding: str, expected: str) -> None:
+    assert negotiate(accept_encoding, ("br", "gzip")) == expected
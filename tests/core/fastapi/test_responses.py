@@ -0,0 +1,55 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.schemas.response import TaskBulkCreateResponse, TaskResponse
+from core.fastapi.responses import (
+    FastJSONResponse,
+    list_adapter,
+    model_list_response,
+    model_response,
+)
+
+
+def fake_task():
+    return SimpleNamespace(
+        id=1,
+        title="Buy Groceries",
+        description=None,
+        completed=False,
+        created_at=datetime(2024, 11, 16, 14, 30),
+        updated_at=datetime(2024, 11, 16, 14, 30),
+        version=1,
+    )
+
+
+class TestResponses:
+    def test_fast_json_response(self):
+        # When
+        response = FastJSONResponse({"created_at": datetime(2024, 11, 16, 14, 30)})
+
+        # Then
+        assert json.loads(response.body) == {"created_at": "2024-11-16T14:30:00"}
+        assert response.media_type == "application/json"
+
+    def test_model_list_response(self):
+        # Given
+        task = fake_task()
+
+        # When
+        response = model_list_response(TaskResponse, [task])
+
+        # Then
+        assert json.loads(response.body)[0]["title"] == "Buy Groceries"
+        assert list_adapter(TaskResponse) is list_adapter(TaskResponse)
+
+    def test_model_response(self):
+        # Given
+        result = {"created": [fake_task()], "conflicts": []}
+
+        # When
+        response = model_response(TaskBulkCreateResponse, result, status_code=201)
+
+        # Then
+        assert response.status_code == 201
+        assert json.loads(response.body)["created"][0]["title"] == "Buy Groceries"
@@ -0,0 +1,108 @@
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.models.task import Task
+from core.config import config
+from core.database.replicas import ReplicaSet
+from core.database.session import engines, record_statement, session
+from core.database.timing import instrument_engine
+from core.fastapi.middleware.sqlalchemy import SQLAlchemyMiddleware
+
+
+async def without_db(request):
+    return PlainTextResponse(str(session.registry.has()))
+
+
+async def with_db(request):
+    session()
+    return PlainTextResponse(str(session.registry.has()))
+
+
+app = SQLAlchemyMiddleware(
+    Starlette(routes=[Route("/without-db", without_db), Route("/with-db", with_db)])
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, created", [("/without-db", "False"), ("/with-db", "True")])
+async def test_session_created_on_first_use(path: str, created: str) -> None:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(path)
+
+    assert response.text == created
+    assert not session.registry.registry
+
+
+async def read_bind(request):
+    bind = session.get_bind(clause=select(Task))
+    writer = bind is engines["writer"].sync_engine
+    return PlainTextResponse("writer" if writer else "replica")
+
+
+async def write_bind(request):
+    session.get_bind(clause=update(Task))
+    return PlainTextResponse("wrote")
+
+
+routing_app = SQLAlchemyMiddleware(
+    Starlette(routes=[Route("/read", read_bind), Route("/write", write_bind)])
+)
+
+
+@pytest.mark.asyncio
+async def test_writes_stick_the_client_to_the_writer(monkeypatch) -> None:
+    monkeypatch.setattr("core.database.replicas.event.listen", lambda *args: None)
+    replica = SimpleNamespace(
+        pool=SimpleNamespace(checkedout=lambda: 0), sync_engine=object()
+    )
+    replica_set = ReplicaSet([replica])
+    monkeypatch.setattr(
+        importlib.import_module("core.database.session"), "replicas", replica_set
+    )
+    monkeypatch.setattr("core.fastapi.middleware.sqlalchemy.replicas", replica_set)
+
+    async with AsyncClient(app=routing_app, base_url="http://test") as client:
+        assert (await client.get("/read")).text == "replica"
+        response = await client.get("/write")
+        cookie = response.headers["set-cookie"]
+        assert f"Max-Age={config.READ_YOUR_WRITES_WINDOW}" in cookie
+        assert (await client.get("/read")).text == "writer"
+
+
+@pytest.mark.asyncio
+async def test_server_timing_reports_database_time(monkeypatch) -> None:
+    monkeypatch.setattr(config, "SERVER_TIMING_ENABLED", True)
+    engine = create_async_engine(config.POSTGRES_URL)
+    instrument_engine(engine, "test", record_statement)
+
+    async def queries(request):
+        async with engine.connect() as connection:
+            for _ in range(3):
+                await connection.execute(text("SELECT 1"))
+        return PlainTextResponse("ok")
+
+    timed_app = SQLAlchemyMiddleware(Starlette(routes=[Route("/queries", queries)]))
+    try:
+        async with AsyncClient(app=timed_app, base_url="http://test") as client:
+            response = await client.get("/queries")
+    finally:
+        await engine.dispose()
+
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+    assert "app;dur=" in response.headers["server-timing"]
+
+
+@pytest.mark.asyncio
+async def test_server_timing_disabled_by_default() -> None:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/with-db")
+
+    assert "server-timing" not in response.headers
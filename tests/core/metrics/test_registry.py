@@ -0,0 +1,42 @@
+import pytest
+
+from core.metrics import Registry
+
+
+def test_counter_and_gauge_render() -> None:
+    registry = Registry()
+    counter = registry.counter("jobs_total", "Jobs run", ("queue",))
+    registry.gauge("workers", "Busy workers", ("pool",), callback=lambda: [(("a",), 3)])
+    counter.inc("default")
+    counter.inc("default", amount=2)
+    counter.inc('say "hi"')
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{queue="default"} 3.0' in lines
+    assert 'jobs_total{queue="say \\"hi\\""} 1.0' in lines
+    assert 'workers{pool="a"} 3.0' in lines
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    registry = Registry()
+    histogram = registry.histogram("latency", "Latency", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, "/")
+
+    lines = registry.render().splitlines()
+
+    assert 'latency_bucket{route="/",le="0.1"} 2' in lines
+    assert 'latency_bucket{route="/",le="1.0"} 3' in lines
+    assert 'latency_bucket{route="/",le="+Inf"} 4' in lines
+    assert 'latency_sum{route="/"} 3.65' in lines
+    assert 'latency_count{route="/"} 4' in lines
+
+
+def test_duplicate_metric() -> None:
+    registry = Registry()
+    registry.counter("jobs_total", "Jobs run")
+    with pytest.raises(ValueError):
+        registry.gauge("jobs_total", "Jobs run")
+
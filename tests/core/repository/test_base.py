@@ -5,8 +5,9 @@ from sqlalchemy.exc import PendingRollbackError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.task import Task
+from core.config import config
 from core.exceptions.base import DatabaseError, UnprocessableEntity
-from core.repository.base import BaseRepo
+from core.repository.base import BaseRepo, statement_cache
 from tests.factory.task import create_fake_task
 
 
@@ -36,6 +37,53 @@ class TestBaseRepo:
         with pytest.raises(UnprocessableEntity) as error:
             await test_repo.create(test_data)
 
+    async def test_bulk_create(self, test_repo: BaseRepo[Task]):
+        # Given
+        existing = await test_repo.create(create_fake_task())
+        test_data = [
+            create_fake_task(id=200001),
+            create_fake_task(id=existing.id),
+            create_fake_task(id=200001),
+        ]
+
+        # When
+        created, conflicts = await test_repo.bulk_create(test_data)
+
+        # Then
+        assert [instance.id for instance in created] == [200001]
+        assert conflicts == [1, 2]
+
+    async def test_bulk_create_with_copy(self, test_repo: BaseRepo[Task], monkeypatch):
+        # Given
+        monkeypatch.setattr(config, "BULK_COPY_THRESHOLD", 2)
+        existing = await test_repo.create(create_fake_task())
+        test_data = [
+            create_fake_task(id=200002),
+            create_fake_task(id=200003),
+            create_fake_task(id=existing.id),
+        ]
+
+        # When
+        created, conflicts = await test_repo.bulk_create(test_data)
+
+        # Then
+        assert sorted(instance.id for instance in created) == [200002, 200003]
+        assert conflicts == [2]
+        assert all(instance.created_at is not None for instance in created)
+
+    @pytest.mark.parametrize("copy", [False, True])
+    async def test_bulk_create_null_uses_default(
+        self, test_repo: BaseRepo[Task], copy: bool
+    ):
+        # Given
+        test_data = [{**create_fake_task(id=200004), "completed": None}]
+
+        # When
+        created, _ = await test_repo.bulk_create(test_data, copy=copy)
+
+        # Then
+        assert created[0].completed is False
+
     async def test_get_all(self, test_repo: BaseRepo[Task]):
         test_data = [create_fake_task() for i in range(2)]
         for data in test_data:
@@ -59,6 +107,82 @@ class TestBaseRepo:
         # Then
         assert len(results) == 2
 
+    async def test_get_all_after_cursor(self, test_repo: BaseRepo[Task]):
+        # Given
+        test_data = [create_fake_task() for i in range(3)]
+        for data in test_data:
+            await test_repo.create(data)
+        first_page = await test_repo.get_all(limit=2)
+
+        # When
+        last = first_page[-1]
+        results = await test_repo.get_all(limit=2, after=(last.id, last.id))
+
+        # Then
+        assert all(result.id > last.id for result in results)
+
+    async def test_get_all_with_filters(self, test_repo: BaseRepo[Task]):
+        # Given
+        await test_repo.create(create_fake_task(title="50%_off sale", completed=True))
+        await test_repo.create(create_fake_task(title="50 percent", completed=True))
+
+        # When
+        results = await test_repo.get_all(
+            filters={"title__prefix": "50%_", "completed": True}
+        )
+
+        # Then
+        assert [result.title for result in results] == ["50%_off sale"]
+
+    async def test_get_all_with_unsupported_sort(self, test_repo: BaseRepo[Task]):
+        # When/Then
+        with pytest.raises(ValueError, match="Sorting by 'title' is not supported"):
+            await test_repo.get_all(sort="title")
+
+    async def test_upsert_update(self, test_repo: BaseRepo[Task]):
+        # Given
+        test_data = create_fake_task()
+        instance, created = await test_repo.upsert(test_data)
+
+        # When
+        replaced, replaced_created = await test_repo.upsert(
+            {**test_data, "title": "Replaced title"}
+        )
+
+        # Then
+        assert created is True
+        assert replaced_created is False
+        assert replaced.id == instance.id
+        assert replaced.title == "Replaced title"
+
+    async def test_upsert_ignore(self, test_repo: BaseRepo[Task]):
+        # Given
+        test_data = create_fake_task()
+        await test_repo.upsert(test_data, on_conflict="ignore")
+
+        # When
+        existing, created = await test_repo.upsert(
+            {**test_data, "title": "Ignored title"}, on_conflict="ignore"
+        )
+
+        # Then
+        assert created is False
+        assert existing.title == test_data["title"]
+
+    async def test_count(self, test_repo: BaseRepo[Task]):
+        # Given
+        filters = {"title__prefix": "Counted task"}
+        await test_repo.create(create_fake_task(title="Counted task"))
+        cached = await test_repo.count(filters, mode="cached")
+
+        # When
+        await test_repo.create(create_fake_task(title="Counted task"))
+
+        # Then
+        assert await test_repo.count(filters) == cached + 1
+        assert await test_repo.count(filters, mode="cached") == cached
+        assert await test_repo.count(filters, mode="estimate") >= 0
+
     async def test_get_by_field(self, test_repo: BaseRepo[Task]):
         # Given
         test_data = create_fake_task()
@@ -77,6 +201,42 @@ class TestBaseRepo:
         # Then
         assert result is None
 
+    async def test_get_by_field_reuses_statement(self, test_repo: BaseRepo[Task]):
+        # Given
+        instance = await test_repo.create(create_fake_task())
+        await test_repo.get_by_field("id", instance.id)
+        cached = statement_cache[(Task, "get_by_field", "id", False)]
+
+        # When
+        result = await test_repo.get_by_field("id", instance.id)
+
+        # Then
+        assert result.id == instance.id
+        assert statement_cache[(Task, "get_by_field", "id", False)] is cached
+
+    async def test_get_all_as_rows(self, test_repo: BaseRepo[Task]):
+        # Given
+        instance = await test_repo.create(create_fake_task())
+
+        # When
+        rows = await test_repo.get_all(
+            limit=100, filters={"title__prefix": instance.title}, as_rows=True
+        )
+        row = await test_repo.get_by_field("id", instance.id, as_rows=True)
+
+        # Then
+        assert row in rows
+        assert row["id"] == instance.id
+        assert set(row.keys()) == {
+            "id",
+            "title",
+            "description",
+            "completed",
+            "created_at",
+            "updated_at",
+            "version",
+        }
+
     async def test_get_by_field_invalid_field(self, test_repo: BaseRepo[Task]):
         # When/Then
         with pytest.raises(ValueError, match="Field 'invalid' does not exist"):
@@ -88,7 +248,7 @@ class TestBaseRepo:
         instance = await test_repo.create(test_task)
 
         # When
-        await test_repo.update_by_id(
+        updated = await test_repo.update_by_id(
             id=instance.id,
             params={
                 "title": test_task["title"],
@@ -96,12 +256,41 @@ class TestBaseRepo:
                 "completed": False,
             },
         )
-        await test_repo.refresh(instance)
+
         # Then
-        updated = await test_repo.get_by_field("id", instance.id)
         assert updated.description == "Milk, Eggs, Bread, Butter"
         assert updated.title == test_task["title"]
 
+    async def test_update_many_with_filter(self, test_repo: BaseRepo[Task]):
+        # Given
+        instances = [
+            await test_repo.create(create_fake_task(title="Sprint 42 task"))
+            for i in range(3)
+        ]
+        after = min(instance.id for instance in instances) - 1
+
+        # When
+        updated = await test_repo.update_many(
+            {"description": "done"},
+            filters={"title": "Sprint 42 task"},
+            after=after,
+            limit=2,
+        )
+
+        # Then
+        assert sorted(updated) == sorted(instance.id for instance in instances)[:2]
+
+    async def test_delete_many(self, test_repo: BaseRepo[Task]):
+        # Given
+        instances = [await test_repo.create(create_fake_task()) for i in range(2)]
+        ids = [instance.id for instance in instances]
+
+        # When
+        deleted = await test_repo.delete_many(ids=ids + [999999])
+
+        # Then
+        assert sorted(deleted) == sorted(ids)
+
     async def test_delete(self, test_repo: BaseRepo[Task]):
         # Given
         test_task = create_fake_task()
@@ -119,9 +308,10 @@ class TestBaseRepo:
         instance = await test_repo.create(test_task)
 
         # When
-        await test_repo.delete_by_id(instance.id)
+        deleted_id = await test_repo.delete_by_id(instance.id)
 
         # Then
+        assert deleted_id == instance.id
         result = await test_repo.get_by_field(field="id", value=instance.id)
         assert result is None
 
@@ -0,0 +1,44 @@
+import pytest
+
+from core.utils.stream import iter_csv_records, iter_lines, iter_ndjson_records
+
+
+async def chunked(data: bytes, size: int = 3):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.asyncio
+class TestStream:
+    async def test_iter_lines_across_chunks(self):
+        # Given
+        data = "first\nsécond\nlast".encode()
+
+        # When
+        lines = [line async for line in iter_lines(chunked(data))]
+
+        # Then
+        assert lines == ["first\n", "sécond\n", "last"]
+
+    async def test_iter_ndjson_records(self):
+        # Given
+        data = b'{"id": 1}\n\n[1]\n{"id": 2}\n'
+
+        # When
+        records = [record async for record in iter_ndjson_records(chunked(data))]
+
+        # Then
+        assert records[0] == (1, {"id": 1})
+        assert records[1][0] == 3 and isinstance(records[1][1], ValueError)
+        assert records[2] == (4, {"id": 2})
+
+    async def test_iter_csv_records_with_multiline_field(self):
+        # Given
+        data = b'id,title,description\n1,"Buy\nMilk",\n2,Walk\n'
+
+        # When
+        records = [record async for record in iter_csv_records(chunked(data))]
+
+        # Then
+        assert records[0] == (2, {"id": "1", "title": "Buy\nMilk"})
+        assert records[1][0] == 4 and isinstance(records[1][1], ValueError)